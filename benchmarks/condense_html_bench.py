@@ -0,0 +1,78 @@
+# Standard library imports
+import argparse
+import glob
+import statistics
+import time
+
+# Third-party imports
+import htmlmin
+import pandas as pd
+from lxml.html.clean import Cleaner
+
+# Local application imports
+from utils.html_condenser import condense, condense_many
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+# Microbenchmark: shared condensing pipeline vs. the old per-call setup.
+# Run from the repo root:
+#     python -m benchmarks.condense_html_bench Company_2026-10-01.csv [more.csv | pages/*.html] [-r 5] [-p 4]
+# The corpus is the job_desc column of scraper output CSVs and/or raw .html files.
+
+def condense_html_per_call(raw_html:str) -> str:
+    '''The previous condense_html: a fresh minifier setup and Cleaner on every call.'''
+    if not raw_html:
+        return ""
+
+    minified = htmlmin.minify(raw_html,remove_comments=True,reduce_boolean_attributes=True)
+    cleaner = Cleaner()
+    cleaner.javascript = True
+    cleaner.style = True
+
+    return cleaner.clean_html(minified)
+
+def load_corpus(paths:list[str]) -> list[str]:
+    corpus = []
+    for pattern in paths:
+        for path in glob.glob(pattern):
+            if path.endswith(".csv"):
+                corpus.extend(str(value) for value in pd.read_csv(path, usecols=["job_desc"])["job_desc"].dropna())
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    corpus.append(f.read())
+    return corpus
+
+def time_runs(label:str, func, repeats:int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<28} best {best*1000:9.1f} ms   median {statistics.median(timings)*1000:9.1f} ms")
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark condense_html on a corpus of postings")
+    parser.add_argument("paths", nargs="+", help="Scraper output CSVs (job_desc column) and/or .html files; globs allowed")
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument("-p", "--processes", type=int, default=4, help="Worker processes for the condense_many run")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths)
+    assert corpus, "No postings found in the given paths"
+    print(f"{len(corpus)} postings, {sum(len(doc) for doc in corpus)/1e6:.1f} MB of HTML")
+
+    # the shared pipeline must produce exactly what the old path did
+    mismatches = sum(condense_html_per_call(doc) != condense(doc) for doc in corpus)
+    print(f"Output mismatches vs per-call path: {mismatches}")
+
+    baseline = time_runs("per-call (old)", lambda: [condense_html_per_call(doc) for doc in corpus], args.repeats)
+    shared = time_runs("shared pipeline", lambda: [condense(doc) for doc in corpus], args.repeats)
+    bulk = time_runs(f"condense_many (-p {args.processes})", lambda: condense_many(corpus, processes=args.processes), args.repeats)
+
+    print(f"Speedup: shared {baseline/shared:.2f}x, bulk {baseline/bulk:.2f}x")
@@ -0,0 +1,199 @@
+# Standard library imports
+import argparse
+import email
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third-party imports
+from openai import OpenAI
+
+# Local application imports
+from utils.openai_batch import build_batch_file, read_batch_results, submit_batch, wait_for_batch
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+# A local mock of the OpenAI Files + Batch API, for running deferred analysis without a real account.
+# Run from the repo root:
+#     python -m benchmarks.openai_batch_mock [--requests 200] [--fail-every 25] [--polls 2]
+#         runs build_batch_file -> submit_batch -> wait_for_batch -> read_batch_results against it end to end
+#     python -m benchmarks.openai_batch_mock --serve [--port 8765]
+#         just serves it; point a scrape at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+
+class MockBatchApi():
+    """
+    In-memory files and batches:
+        POST /v1/files                     upload a batch input file (multipart)
+        POST /v1/batches                   start a batch on an uploaded file
+        GET  /v1/batches/{id}              in_progress for the first `polls` retrievals, then completed
+        GET  /v1/files/{id}/content        file contents (the output file once a batch completes)
+    Every fail_every-th request in a batch comes back as a 500, so the failure path is exercised too.
+    """
+    def __init__(self, polls:int=2, fail_every:int=0):
+        self.polls = polls
+        self.fail_every = fail_every
+        self.files = {}
+        self.batches = {}
+        self.uploads = 0
+        self._lock = threading.Lock()
+
+    def _new_id(self, prefix:str, table:dict) -> str:
+        return f"{prefix}-{len(table)+1:04d}"
+
+    def create_file(self, content:bytes, filename:str, purpose:str) -> dict:
+        with self._lock:
+            file_id = self._new_id("file", self.files)
+            self.files[file_id] = content
+            self.uploads += 1
+        return {"id":file_id, "object":"file", "bytes":len(content), "created_at":int(time.time()),
+            "filename":filename, "purpose":purpose, "status":"processed"}
+
+    def create_batch(self, params:dict) -> dict:
+        lines = [line for line in self.files[params["input_file_id"]].decode("utf-8").splitlines() if line.strip()]
+        with self._lock:
+            batch_id = self._new_id("batch", self.batches)
+            self.batches[batch_id] = {"id":batch_id, "object":"batch", "endpoint":params["endpoint"],
+                "input_file_id":params["input_file_id"], "completion_window":params["completion_window"],
+                "status":"in_progress", "created_at":int(time.time()), "output_file_id":None,
+                "request_counts":{"total":len(lines), "completed":0, "failed":0},
+                "_lines":lines, "_polls":0}
+        return self._public(self.batches[batch_id])
+
+    def retrieve_batch(self, batch_id:str) -> dict:
+        with self._lock:
+            batch = self.batches[batch_id]
+            batch["_polls"] += 1
+            if batch["status"] == "in_progress" and batch["_polls"] > self.polls:
+                self._complete(batch)
+        return self._public(batch)
+
+    def _complete(self, batch:dict) -> None:
+        output = []
+        for number, line in enumerate(batch["_lines"], start=1):
+            request = json.loads(line)
+            if self.fail_every and number % self.fail_every == 0:
+                output.append({"id":f"req-{number}", "custom_id":request["custom_id"],
+                    "response":{"status_code":500, "body":{"error":{"message":"mock failure"}}}, "error":None})
+                batch["request_counts"]["failed"] += 1
+                continue
+            prompt_tokens = sum(len(message["content"].split()) for message in request["body"]["messages"])
+            output.append({"id":f"req-{number}", "custom_id":request["custom_id"], "error":None,
+                "response":{"status_code":200, "body":{"id":f"chatcmpl-{number}", "object":"chat.completion",
+                    "created":int(time.time()), "model":request["body"]["model"],
+                    "choices":[{"index":0, "finish_reason":"stop",
+                        "message":{"role":"assistant", "content":f"mock answer for {request['custom_id']}"}}],
+                    "usage":{"prompt_tokens":prompt_tokens, "completion_tokens":5, "total_tokens":prompt_tokens+5}}}})
+            batch["request_counts"]["completed"] += 1
+        output_file_id = self._new_id("file", self.files)
+        self.files[output_file_id] = "".join(json.dumps(entry) + "\n" for entry in output).encode("utf-8")
+        batch["output_file_id"] = output_file_id
+        batch["status"] = "completed"
+
+    @staticmethod
+    def _public(batch:dict) -> dict:
+        return {key:value for key, value in batch.items() if not key.startswith("_")}
+
+def _multipart_fields(content_type:str, body:bytes) -> dict:
+    '''name -> (filename, bytes) for each part of a multipart/form-data body.'''
+    message = email.message_from_bytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body)
+    return {part.get_param("name", header="content-disposition"):(part.get_filename(), part.get_payload(decode=True))
+        for part in message.get_payload()}
+
+def serve_mock_api(api:MockBatchApi, port:int=0):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status:int, body:bytes, content_type:str="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, payload:dict, status:int=200):
+            self._send(status, json.dumps(payload).encode("utf-8"))
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path == "/v1/files":
+                fields = _multipart_fields(self.headers["Content-Type"], body)
+                filename, content = fields["file"]
+                self._send_json(api.create_file(content, filename, fields["purpose"][1].decode("utf-8")))
+            elif self.path == "/v1/batches":
+                self._send_json(api.create_batch(json.loads(body)))
+            else:
+                self._send_json({"error":{"message":f"no mock for POST {self.path}"}}, status=404)
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in api.batches:
+                self._send_json(api.retrieve_batch(parts[2]))
+            elif parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content" and parts[2] in api.files:
+                self._send(200, api.files[parts[2]], content_type="application/octet-stream")
+            else:
+                self._send_json({"error":{"message":f"no mock for GET {self.path}"}}, status=404)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_requests(count:int) -> list[dict]:
+    '''Requests shaped like _run_deferred_openai_analysis builds them.'''
+    return [{"custom_id":f"{position}|jd_text_eval",
+        "body":{"model":"mock-model",
+            "messages":[{"role":"system", "content":f"Consider this job description: posting {position}"},
+                {"role":"user", "content":"PROPRIETARY EVAL QUERY"}]}} for position in range(count)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the OpenAI Batch API")
+    parser.add_argument("--serve", action="store_true", help="Only serve the mock until interrupted")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --serve")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--fail-every", type=int, default=25, help="Fail every Nth request in a batch (0=never)")
+    parser.add_argument("--polls", type=int, default=2, help="Retrievals that report in_progress before the batch completes")
+    args = parser.parse_args()
+
+    api = MockBatchApi(polls=args.polls, fail_every=args.fail_every)
+    server = serve_mock_api(api, port=args.port if args.serve else 0)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    if args.serve:
+        print(f"Mock Batch API on {base_url}; run with OPENAI_BASE_URL={base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        raise SystemExit
+
+    client = OpenAI(api_key="mock", base_url=base_url)
+    requests_sent = make_requests(args.requests)
+    with tempfile.TemporaryDirectory() as directory:
+        batch_path = os.path.join(directory, "mock_openai_batch.jsonl")
+        state_path = os.path.join(directory, "mock_openai_batch_state.json")
+        started = time.perf_counter()
+        input_hash = build_batch_file(requests_sent, batch_path)
+        batch_id = submit_batch(client, batch_path, input_hash, state_path=state_path)
+        batch = wait_for_batch(client, batch_id, poll_seconds=0)
+        results = read_batch_results(client, batch)
+        elapsed = time.perf_counter() - started
+
+        # identical input must pick the same batch back up rather than uploading again
+        resumed_id = submit_batch(client, batch_path, input_hash, state_path=state_path)
+
+    expected_failures = args.requests // args.fail_every if args.fail_every else 0
+    answers_ok = all(completion.choices[0].message.content == f"mock answer for {custom_id}" for custom_id, completion in results.items())
+    print(f"{len(results)}/{args.requests} answers read back in {elapsed:.2f}s (status {batch.status})")
+    checks = {"answers":len(results) == args.requests - expected_failures and answers_ok,
+        "failed requests skipped":batch.request_counts.failed == expected_failures,
+        "resubmit resumed":resumed_id == batch_id and api.uploads == 1}
+    for label, passed in checks.items():
+        print(f"{label:<24} {'ok' if passed else 'MISMATCH'}")
+    server.shutdown()
+    raise SystemExit(0 if all(checks.values()) else 1)
@@ -0,0 +1,114 @@
+# Standard library imports
+import argparse
+import datetime
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Third-party imports
+import requests
+
+# Local application imports
+from utils.paginator import DateWindowPaginator
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+# Benchmark: DateWindowPaginator vs. the old one-page-at-a-time loop, against a local mock
+# of a date-sorted positions API (newest first, fixed latency per request).
+# Run from the repo root:
+#     python -m benchmarks.paginator_bench [--positions 5000] [--latency 0.08] [--lookback 14] [--skip-days 0]
+
+def make_positions(count:int, days:int=120) -> list[dict]:
+    now = time.time()
+    created = sorted((now - random.uniform(0, days*86400) for _ in range(count)), reverse=True)
+    return [{"job_id":i, "name":f"Job {i}", "t_create":int(t)} for i, t in enumerate(created)]
+
+def serve_mock_api(positions:list[dict], latency:float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            start = int(query["start"][0]) - 1  # 1-based, like the real API
+            num = int(query["num"][0])
+            time.sleep(latency)
+            body = json.dumps({"positions":positions[start:start+num]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def old_loop(session, url:str, limit:int, lookback_date, lookback_end_date):
+    '''The previous SessionApiScraper loop (guarded against the short final page so it can finish).'''
+    payload = []
+    requests_made = 0
+    offset = 1
+    oldest_date = datetime.datetime.now().date()
+    while oldest_date >= lookback_date:
+        positions = session.get(url, params={"start":offset, "num":limit}).json()["positions"]
+        requests_made += 1
+        if not positions:
+            break
+        if datetime.datetime.fromtimestamp(positions[-1]['t_create']).date() < oldest_date:
+            oldest_date = datetime.datetime.fromtimestamp(positions[-1]['t_create']).date()
+        for jd in positions:
+            if datetime.datetime.fromtimestamp(jd['t_create']).date() >= lookback_date and datetime.datetime.fromtimestamp(jd['t_create']).date() < lookback_end_date:
+                payload.append(jd['job_id'])
+        offset += limit
+    return payload, requests_made
+
+def paginated(session, url:str, limit:int, prefetch:int, lookback_date, lookback_end_date):
+    paginator = DateWindowPaginator(
+        lambda offset, page_size: session.get(url, params={"start":offset+1, "num":page_size}).json()["positions"],
+        lambda jd: datetime.datetime.fromtimestamp(jd['t_create']).date(),
+        page_size=limit,
+        prefetch=prefetch)
+    payload = [jd['job_id'] for jd, created in paginator.iter_window(oldest=lookback_date, newest=lookback_end_date)]
+    return payload, paginator.requests
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark date-window pagination against a local mock API")
+    parser.add_argument("--positions", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.08, help="Seconds the mock API takes per request")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--lookback", type=int, default=14)
+    parser.add_argument("--skip-days", type=int, default=0, help="Window ends this many days ago (exercises the boundary search)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    server = serve_mock_api(make_positions(args.positions), args.latency)
+    url = f"http://127.0.0.1:{server.server_port}/api/apply/v2/jobs"
+    session = requests.Session()
+
+    today = datetime.datetime.now()
+    lookback_date = (today - datetime.timedelta(days=args.lookback)).date()
+    lookback_end_date = (today - datetime.timedelta(days=args.skip_days)).date()
+    print(f"{args.positions} positions, {args.latency*1000:.0f} ms per request, page size {args.page_size}, "
+        f"window {lookback_date} .. {lookback_end_date}")
+
+    runs = [("old loop", lambda: old_loop(session, url, args.page_size, lookback_date, lookback_end_date))]
+    for prefetch in [1, 2, 4, 8]:
+        runs.append((f"paginator prefetch={prefetch}", lambda prefetch=prefetch: paginated(session, url, args.page_size, prefetch, lookback_date, lookback_end_date)))
+
+    expected = None
+    for label, run in runs:
+        started = time.perf_counter()
+        payload, requests_made = run()
+        elapsed = time.perf_counter() - started
+        expected = payload if expected is None else expected
+        print(f"{label:<24} {elapsed:7.2f}s  {requests_made:5d} requests  {len(payload):5d} postings  {'ok' if payload == expected else 'MISMATCH'}")
+
+    server.shutdown()
@@ -0,0 +1,128 @@
+# Standard library imports
+import argparse
+import random
+import re
+import statistics
+import time
+
+# Third-party imports
+import pandas as pd
+
+# Local application imports
+from scraper_configs import SCRAPER_CONFIGS
+from utils.rule_engine import RuleEngine
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+# Microbenchmark: RuleEngine.scan_frame over a DataFrame of postings vs. the hand-written re.search checks it replaced.
+# Run from the repo root:
+#     python -m benchmarks.rule_engine_bench [Company_2026-10-01.csv ...] [--words 3500] [--extra-rules 30] [-n 50] [-r 5]
+# Without CSVs, postings are generated; phrases the rules look for are sprinkled into some of them.
+
+FILLER = ("team role customer support build deliver experience skills ability work with across our "
+    "and the to of in for on you will we are looking who can help").split()
+
+def old_api_checks(row:dict) -> list:
+    '''The previous ApiScraperWithAnalysis._run_company_analysis checks (region lookup left out).'''
+    role_type = ""
+    schedule_type = ""
+    role_match = re.search(r"Role Type\n(.*?)\n",row['job_info_raw'])
+    if role_match:
+        role_type = role_match.group(1)
+    schedule_match = re.search(r"Job Schedule\n(.*?)\n",row['job_info_raw'])
+    if schedule_match:
+        schedule_type = schedule_match.group(1)
+    contains_important_element = int(bool(re.search("IMPORTANT ELEMENT TEXT",row['section_headers'])))
+    contains_bad_desc = int(bool(re.search("SEARCH TEXT",row['job_desc'])))
+    uses_bad_fmt = int(bool(
+        (re.search("FORMAT ELEMENT 1",row['job_desc'])
+        and re.search("FORMAT ELEMENT 2",row['job_desc'])
+        and re.search("FORMAT ELEMENT 3",row['job_desc'])
+        and re.search("FORMAT ELEMENT 4",row['job_desc'])
+        and re.search("FORMAT ELEMENT 5",row['job_desc']))
+        ))
+    return [role_type, schedule_type, contains_important_element, contains_bad_desc, uses_bad_fmt]
+
+def old_template_checks(row:dict) -> list:
+    '''The previous TemplateValidationScraper._run_company_analysis checks.'''
+    no_extra_pre_text = int(bool(re.match("PATTERN_CHECK,",row['section_headers'])) or bool(re.match("PATTERN_CHECK,",row['job_desc'])))
+    correct_tagline = int(bool(re.search("KEYPHRASE",row['job_desc'])))
+    correct_template = int(bool(
+        re.search("PATTERN_CHECK",row['job_desc'])
+        and re.search("PATTERN_CHECK",row['job_desc'])
+        and re.search("PATTERN_CHECK",row['job_desc'])
+        ))
+    return [no_extra_pre_text, correct_tagline, correct_template]
+
+def extra_rules(count:int) -> list[dict]:
+    '''count plain-phrase "any" rules, as a company with a long checklist would have.'''
+    return [{"name":f"phrase_{i}","field":"job_desc","kind":"any","patterns":[f"checklist phrase {i}"]} for i in range(count)]
+
+def old_extra_checks(row:dict, count:int) -> list:
+    return [int(bool(re.search(f"checklist phrase {i}",row['job_desc']))) for i in range(count)]
+
+def make_rows(count:int, words:int, extra:int) -> list[dict]:
+    phrases = ["SEARCH TEXT", "KEYPHRASE", "PATTERN_CHECK"] + [f"FORMAT ELEMENT {i}" for i in range(1, 6)] + [f"checklist phrase {i}" for i in range(extra)]
+    rows = []
+    for _ in range(count):
+        body = [random.choice(FILLER) for _ in range(words)]
+        for phrase in random.sample(phrases, k=random.randint(0, len(phrases))):
+            body.insert(random.randrange(len(body)), phrase)
+        job_desc = " ".join(body)
+        if random.random() < 0.3:
+            job_desc = "PATTERN_CHECK, " + job_desc
+        rows.append({"job_desc":job_desc,
+            "section_headers":random.choice(["Overview, Responsibilities", "IMPORTANT ELEMENT TEXT, Benefits", "PATTERN_CHECK, Overview"]),
+            "job_info_raw":"Location\nRemote\nRole Type\nFull time\nJob Schedule\nDay\n" if random.random() < 0.7 else "Location\nRemote\n"})
+    return rows
+
+def load_rows(paths:list[str]) -> list[dict]:
+    rows = []
+    for path in paths:
+        frame = pd.read_csv(path)
+        for column in ["job_desc", "section_headers", "job_info_raw"]:
+            frame[column] = frame[column].fillna("").astype(str) if column in frame else ""
+        rows.extend(frame[["job_desc", "section_headers", "job_info_raw"]].to_dict("records"))
+    return rows
+
+def time_runs(label:str, func, repeats:int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<28} best {best*1000:9.1f} ms   median {statistics.median(timings)*1000:9.1f} ms")
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rule engine against the old per-scraper regex checks")
+    parser.add_argument("paths", nargs="*", help="Scraper output CSVs to use as the corpus (default: generated postings)")
+    parser.add_argument("--words", type=int, default=3500, help="Words per generated posting")
+    parser.add_argument("--extra-rules", type=int, default=30, help="Plain-phrase rules added on top of the shipped ones")
+    parser.add_argument("-n", "--postings", type=int, default=50, help="Generated postings")
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    rows = load_rows(args.paths) if args.paths else make_rows(args.postings, args.words, args.extra_rules)
+    print(f"{len(rows)} postings, {sum(len(row['job_desc']) for row in rows)/1e6:.1f} MB of text")
+
+    suites = [("shipped api rules", RuleEngine(SCRAPER_CONFIGS["api_scraper_with_analysis"]["rules"]), old_api_checks),
+        ("shipped template rules", RuleEngine(SCRAPER_CONFIGS["template_validation_scraper"]["rules"]), old_template_checks),
+        (f"{args.extra_rules} phrase rules", RuleEngine(extra_rules(args.extra_rules)), lambda row: old_extra_checks(row, args.extra_rules))]
+
+    frame = pd.DataFrame(rows)
+    for label, engine, old_checks in suites:
+        print(f"\n{label}")
+        # the engine must produce exactly what the old checks did
+        scanned_frame = engine.scan_frame(frame)
+        mismatches = sum(old_checks(row) != list(values) for row, values in zip(rows, scanned_frame.itertuples(index=False)))
+        print(f"Output mismatches vs old checks: {mismatches}")
+        baseline = time_runs("re.search per check (old)", lambda: [old_checks(row) for row in rows], args.repeats)
+        scanned = time_runs("RuleEngine.scan_frame", lambda: engine.scan_frame(frame), args.repeats)
+        print(f"Speedup: {baseline/scanned:.2f}x")
@@ -31,4 +31,5 @@ BASE_HEADERS = ['url',
             "cx_eval_2",
             "cx_eval_3",
             "cx_eval_4",
-            "cx_eval_5"]
+            "cx_eval_5",
+            "gendered_term_hits"]
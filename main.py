@@ -1,5 +1,9 @@
 from utils.base_utils import *
 from utils.report_constructor import *
+from utils.analysis_cache import AnalysisCache
+from utils.checkpoint_log import CheckpointLog
+from utils.gender_lexicon import GenderLexicon
+from utils.langtools import configure_langtools
 
 from scrapers.template_validation_scraper import *
 from scrapers.api_scraper_with_analysis import *
@@ -75,6 +79,127 @@ parser.add_argument(
     help="Resume from last checkpoint (0=no, 1=yes)"
 )
 
+parser.add_argument(
+    '-w', '--workers', 
+    type=int, 
+    default=1, 
+    help="Number of concurrent workers processing job descriptions. Each worker runs its own browser (1=sequential)"
+)
+
+parser.add_argument(
+    '--batch-prompts', 
+    type=int, 
+    default=0, 
+    choices=[0,1], 
+    help="Send all base and cx OpenAI evaluations for a job in one JSON-structured request (0=off, 1=on)"
+)
+
+parser.add_argument(
+    '--cache', 
+    type=int, 
+    default=0, 
+    choices=[0,1], 
+    help="Reuse LanguageTool and OpenAI results for unchanged job descriptions from the on-disk analysis cache (0=off, 1=on)"
+)
+
+parser.add_argument(
+    '--incremental', 
+    type=int, 
+    default=0, 
+    choices=[0,1], 
+    help="Skip urls whose sitemap lastmod / API posted date hasn't changed since the last run and carry their prior row forward (0=off, 1=on)"
+)
+
+parser.add_argument(
+    '--langtools-server', 
+    type=str, 
+    default=None, 
+    help="Base url of a self-hosted LanguageTool server (e.g. http://localhost:8081) to use instead of the hosted API"
+)
+
+parser.add_argument(
+    '--langtools-concurrency', 
+    type=int, 
+    default=4, 
+    help="Maximum concurrent requests to the LanguageTool backend"
+)
+
+parser.add_argument(
+    '--deferred-analysis', 
+    type=int, 
+    default=0, 
+    choices=[0,1], 
+    help="Scrape everything first, then run all OpenAI evaluations as one Batch API job (0=off, 1=on)"
+)
+
+parser.add_argument(
+    '--prompt-concurrency', 
+    type=int, 
+    default=1, 
+    help="OpenAI questions per job description sent in parallel, after the first request has warmed the shared prompt prefix"
+)
+
+parser.add_argument(
+    '--gender-words', 
+    type=str, 
+    nargs=2, 
+    default=None, 
+    metavar=('MASCULINE_FILE', 'FEMININE_FILE'),
+    help="Load masculine/feminine-coded word stems (one per line) from external lists instead of the built-in ones"
+)
+
+parser.add_argument(
+    '--archive-pages', 
+    type=int, 
+    default=1, 
+    choices=[0,1], 
+    help="Keep every fetched page's raw HTML in archives/{company}_{date}_pages.sqlite for offline re-analysis (0=off, 1=on)"
+)
+
+parser.add_argument(
+    '--reanalyze', 
+    type=str, 
+    default=None, 
+    metavar='ARCHIVE',
+    help="Re-run extraction and analysis from a page archive instead of scraping. No browser is started"
+)
+
+parser.add_argument(
+    '--status-every', 
+    type=int, 
+    default=10, 
+    help="Log progress (jobs/sec, ETA, stage latencies, errors) and refresh the status file every N rows"
+)
+
+parser.add_argument(
+    '--status-file', 
+    type=str, 
+    default=None, 
+    help="Where to write the JSON run status (default: status/{company}_{date}_status.json)"
+)
+
+parser.add_argument(
+    '--parquet', 
+    type=int, 
+    default=1, 
+    choices=[0,1], 
+    help="Also write the results as typed Parquet, partitioned by company and scrape date (0=off, 1=on)"
+)
+
+parser.add_argument(
+    '--parquet-dir', 
+    type=str, 
+    default="output/parquet", 
+    help="Root directory of the partitioned Parquet history"
+)
+
+parser.add_argument(
+    '--output-buffer', 
+    type=int, 
+    default=200, 
+    help="Write finished rows to the output every N rows instead of holding them all until the end (deferred analysis always holds them)"
+)
+
 args = parser.parse_args()
 
 # Set up logging
@@ -85,25 +210,52 @@ logger.setLevel(logging.INFO)
 checkpoint_url = None
 url_scrape_data = None
 
-if args.checkpoint == 1:
-    checkpoint_url = load_checkpoint()
-    url_scrape_data = load_checkpoint_data()
+# Point LanguageTool at the right backend
+if args.langtools_server:
+    configure_langtools(backend="local", server_url=args.langtools_server, max_concurrency=args.langtools_concurrency)
+else:
+    configure_langtools(backend="hosted", max_concurrency=args.langtools_concurrency)
 
 # Get the appropriate scraper class and configuration
 ScraperClass = SCRAPER_CLASSES[args.scraper_type]
 config = SCRAPER_CONFIGS[args.scraper_type]
 
+if args.checkpoint == 1:
+    # a replay resumes from its own checkpoint, never from the scrape's (that would restore the old analysis as-is)
+    checkpoint_path = CheckpointLog.latest_path(f"{config['name']}_reanalyzed" if args.reanalyze else config['name'])
+    url_scrape_data = CheckpointLog.load(checkpoint_path)
+    if url_scrape_data:
+        checkpoint_url = list(url_scrape_data)[-1]
+        print(f"Loaded {len(url_scrape_data)} checkpointed rows from {checkpoint_path}")
+
 # Initialize the scraper
 print(f"\n{'='*60}")
 print(f"Initializing {args.scraper_type} scraper")
 print(f"Dev mode: {'ON' if args.dev_mode else 'OFF'}")
+print(f"Workers: {args.workers}")
+if args.reanalyze:
+    print(f"Re-analyzing archived pages: {args.reanalyze}")
 print(f"{'='*60}\n")
 
 report = ScraperClass(
     config_args=config,
     checkpoint_url=checkpoint_url,
     dev_mode=args.dev_mode,
-    lookback=args.lookback
+    lookback=args.lookback,
+    workers=args.workers,
+    batch_prompts=args.batch_prompts,
+    analysis_cache=AnalysisCache() if args.cache == 1 else None,
+    incremental=args.incremental,
+    checkpoint_data=url_scrape_data,
+    deferred_analysis=args.deferred_analysis,
+    prompt_concurrency=args.prompt_concurrency,
+    gender_lexicon=GenderLexicon.from_files(masculine=args.gender_words[0], feminine=args.gender_words[1]) if args.gender_words else None,
+    archive_pages=args.archive_pages,
+    reanalyze=args.reanalyze,
+    status_every=args.status_every,
+    status_path=args.status_file,
+    parquet_dir=args.parquet_dir if args.parquet == 1 else None,
+    output_buffer_rows=args.output_buffer
 )
 
 # Run the scraping job
@@ -9,6 +9,15 @@ SCRAPER_CONFIGS = {
                     {"name":"title","xpath":"PATH_TO_TITLE","func":get_xpath_text},
                     {"name":"description","xpath":"PATH_TO_BODY","func":get_condensed_html},
                     {"name":"meta","xpath":"PATH_TO_METADATA","func":get_untagged_html}
+                ],
+                # template checks, in output column order (see utils/rule_engine.py)
+                "rules":[
+                    # no substantive text before a certain element, in either of the two client formats
+                    {"name":"no_extra_pre_text","field":["section_headers","job_desc"],"kind":"any","anchored":True,"patterns":["PATTERN_CHECK,"]},
+                    # correct usage of KEYPHRASE
+                    {"name":"is_correct_tagline","field":"job_desc","kind":"any","patterns":["KEYPHRASE"]},
+                    # overall correct template outline
+                    {"name":"is_correct_template","field":"job_desc","kind":"all","patterns":["PATTERN_CHECK","PATTERN_CHECK","PATTERN_CHECK"]}
                 ]
                 },
 
@@ -20,6 +29,17 @@ SCRAPER_CONFIGS = {
                     {"name":"title","xpath":"PATH_TO_TITLE","func":get_xpath_text},
                     {"name":"description","xpath":"PATH_TO_BODY","func":get_condensed_html},
                     {"name":"meta","xpath":"PATH_TO_METADATA","func":get_untagged_html}
+                    ],
+                # company checks, in output column order (see utils/rule_engine.py)
+                "rules":[
+                    {"name":"role_type","field":"job_info_raw","kind":"extract","patterns":[r"Role Type\n(.*?)\n"],"default":""},
+                    {"name":"schedule_type","field":"job_info_raw","kind":"extract","patterns":[r"Job Schedule\n(.*?)\n"],"default":""},
+                    # important element in the section headers
+                    {"name":"contains_important_element","field":"section_headers","kind":"any","patterns":["IMPORTANT ELEMENT TEXT"]},
+                    # bad (copy/paste) description in the JD body
+                    {"name":"contains_bad_description","field":"job_desc","kind":"any","patterns":["SEARCH TEXT"]},
+                    # API Company's old (bad) format in the JD body
+                    {"name":"uses_bad_format","field":"job_desc","kind":"all","patterns":["FORMAT ELEMENT 1","FORMAT ELEMENT 2","FORMAT ELEMENT 3","FORMAT ELEMENT 4","FORMAT ELEMENT 5"]}
                     ]
                 },
 
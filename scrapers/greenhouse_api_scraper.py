@@ -15,8 +15,10 @@ from utils.report_constructor import *
 
 
 class GreenhouseApiScraper(ReportConstructor):
-    def __init__(self, config_args:dict, checkpoint_url = None, dev_mode=0, lookback=14):
-        super().__init__(config_args, checkpoint_url, dev_mode)
+    freshness_column = "published"
+
+    def __init__(self, config_args:dict, checkpoint_url = None, dev_mode=0, lookback=14, **kwargs):
+        super().__init__(config_args, checkpoint_url, dev_mode, **kwargs)
 
     def _process_sitemap(self) -> None:
         BASE = "https://boards-api.greenhouse.io/v1/boards/example"
@@ -52,6 +54,3 @@ class GreenhouseApiScraper(ReportConstructor):
         self.job_counter = 0
         self.num_jobs = len(self.manifest_df['url'])
         print(f"| --- Found {self.num_jobs} Job Descriptions --- |")
-    
-    def _extend_with_company_analysis(self, source_row, working_payload):
-        return []
\ No newline at end of file
@@ -8,8 +8,10 @@ from utils.report_constructor import *
 
 
 class SessionApiScraper(ReportConstructor):
-    def __init__(self, config_args:dict, checkpoint_url = None, dev_mode=0,lookback=14):
-        super().__init__(config_args, checkpoint_url, dev_mode)
+    freshness_column = "posted_date"
+
+    def __init__(self, config_args:dict, checkpoint_url = None, dev_mode=0, lookback=14, **kwargs):
+        super().__init__(config_args, checkpoint_url, dev_mode, **kwargs)
 
         assert isinstance(self.xpaths, list), "Xpaths in Siemens config should be a list of dictionaries with configuration parameters for each XPath."
 
@@ -22,48 +24,50 @@ class SessionApiScraper(ReportConstructor):
             'HEADER': 'PAYLOAD',
             }
         self.start = 0
-        self.LIMIT = 10
-        self.LAST_ITEM = self.LIMIT - 1
+        self.LIMIT = config_args.get('page_size', 10)
         self.offset = 1
+        # pages requested ahead while the current one is processed
+        self.prefetch = config_args.get('api_prefetch', 2)
         self.lookback = lookback
-        self.oldest_date = datetime.datetime.now().date()
         self.lookback_datetime = datetime.datetime.now() - datetime.timedelta(days = self.lookback)
         self.lookback_end_dt = datetime.datetime.now() - datetime.timedelta(days = self.start)
         self.lookback_end_date = self.lookback_end_dt.date()
         self.lookback_date = self.lookback_datetime.date()
         self.sitemap_cols = ['id','title','primary_location','posted_date','department','business_unit','work_location_option','is_private',"url"]
 
-    def _process_sitemap(self):
-        scrape_payload = []
-        print(f"| --- Scraping the {self.domain} site API for job descriptions --- |")
-        while self.oldest_date >= self.lookback_date:
-            print(f"Scraping jobs {self.offset}-{self.offset+self.LIMIT}... ")
-
-            params = [
-                ('domain', 'example.com'),
-                ('start', f'{self.offset}'),
-                ('num', f'{self.LIMIT}'),
-                ('query', 'DEPARTMENT'),
-                ('pid', 'SAMPLE'),
-                ('sort_by', 't_create'),
-            ]
+    def _fetch_positions(self, offset:int, limit:int) -> list[dict]:
+        '''One page of positions, newest first. The API's start index is 1-based.'''
+        params = [
+            ('domain', 'example.com'),
+            ('start', f'{self.offset + offset}'),
+            ('num', f'{limit}'),
+            ('query', 'DEPARTMENT'),
+            ('pid', 'SAMPLE'),
+            ('sort_by', 't_create'),
+        ]
 
-            response = self.session.get(
-                'https://jobs.example.com/api/apply/v2/jobs',
-                params=params,
-                cookies=self.cookies,
-                headers=self.headers,
-            )
-            response_parsed = json.loads(response.text)
+        response = self.session.get(
+            'https://jobs.example.com/api/apply/v2/jobs',
+            params=params,
+            cookies=self.cookies,
+            headers=self.headers,
+            timeout=30,
+        )
+        response.raise_for_status()
+        return json.loads(response.text)['positions']
 
-            if datetime.datetime.fromtimestamp(response_parsed['positions'][self.LAST_ITEM]['t_create']).date() < self.oldest_date:
-                self.oldest_date = datetime.datetime.fromtimestamp(response_parsed['positions'][self.LAST_ITEM]['t_create']).date()
-
-            for jd in response_parsed['positions']:
-                if datetime.datetime.fromtimestamp(jd['t_create']).date() >= self.lookback_date and datetime.datetime.fromtimestamp(jd['t_create']).date() < self.lookback_end_date:
-                    scrape_payload.append([jd['job_id'],jd['name'],jd['location'],datetime.datetime.fromtimestamp(jd['t_create']).strftime("%Y-%m-%d"),jd['department'],jd['business_unit'], jd['work_location'],jd['isPrivate'],jd['Url']])
+    def _process_sitemap(self):
+        '''Page through the date-sorted positions API, keeping the postings created in the lookback window.'''
+        print(f"| --- Scraping the {self.domain} site API for job descriptions --- |")
+        paginator = DateWindowPaginator(self._fetch_positions,
+            lambda jd: datetime.datetime.fromtimestamp(jd['t_create']).date(),
+            page_size=self.LIMIT,
+            prefetch=self.prefetch)
 
-            self.offset+=self.LIMIT
+        scrape_payload = []
+        for jd, created in paginator.iter_window(oldest=self.lookback_date, newest=self.lookback_end_date):
+            scrape_payload.append([jd['job_id'],jd['name'],jd['location'],created.strftime("%Y-%m-%d"),jd['department'],jd['business_unit'], jd['work_location'],jd['isPrivate'],jd['Url']])
+        print(f"Read {paginator.requests} pages of {self.LIMIT} positions")
 
         payload = pd.DataFrame(scrape_payload, columns=self.sitemap_cols)
         self.manifest_df = payload
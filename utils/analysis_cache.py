@@ -0,0 +1,118 @@
+# Standard library imports
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class AnalysisCache():
+    """
+    Persistent, content-addressed store for the expensive per-JD analysis results
+    (LanguageTool feedback and OpenAI evaluations).
+
+    Entries are keyed by a hash of whatever determines the result -- the preprocessed
+    description text, plus the prompt set and model for OpenAI results -- so a posting
+    that hasn't changed since the last run is answered from disk.
+        - Entries older than max_age_days are dropped on eviction.
+        - If the cache holds more than max_entries rows or max_bytes of payload,
+          the least recently used entries are dropped until it fits.
+    Safe to share between worker threads.
+    """
+    def __init__(self, path:str="analysis_cache.sqlite", max_entries:int=100000, max_bytes:int=500*1024*1024, max_age_days:int=30):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON analysis_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        '''Hash any JSON-serializable parts into a stable cache key.'''
+        encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, kind:str, key:str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None or row[1] < time.time() - self.max_age_days*86400:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE analysis_cache SET accessed_at = ? WHERE kind = ? AND key = ?", (time.time(), kind, key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, kind:str, key:str, value) -> None:
+        encoded = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (kind, key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, encoded, len(encoded), now, now)
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        '''Drop expired entries, then least recently used entries until the cache fits its limits.
+        Returns the number of entries removed.'''
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM analysis_cache WHERE created_at < ?", (time.time() - self.max_age_days*86400,)
+            ).rowcount
+
+            count, total_size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis_cache").fetchone()
+            if count > self.max_entries or total_size > self.max_bytes:
+                # walk from the least recently used end and find where we're back under both limits
+                drop_rows = 0
+                drop_bytes = 0
+                for (size,) in self._conn.execute("SELECT size FROM analysis_cache ORDER BY accessed_at ASC"):
+                    if count - drop_rows <= self.max_entries and total_size - drop_bytes <= self.max_bytes:
+                        break
+                    drop_rows += 1
+                    drop_bytes += size
+                removed += self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE rowid IN (SELECT rowid FROM analysis_cache ORDER BY accessed_at ASC LIMIT ?)", (drop_rows,)
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total_size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis_cache").fetchone()
+        lookups = self.hits + self.misses
+        return {"hits":self.hits,
+            "misses":self.misses,
+            "hit_rate":round(self.hits/lookups, 3) if lookups else 0.0,
+            "entries":count,
+            "bytes":total_size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
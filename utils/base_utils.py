@@ -2,20 +2,24 @@
 import json
 import logging
 import re
+import threading
+from html import escape
 from logging.handlers import RotatingFileHandler
 
 # Third-party imports
-import htmlmin
 import lxml
 from bs4 import BeautifulSoup
 from lxml import html
-from lxml.html.clean import Cleaner
 from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 
 # Local application imports
 from constants import OPENAI_API_KEY
+from utils.gender_lexicon import GenderLexicon
+from utils.html_condenser import condense
 from utils.langtools import check_language, process_langtools_response
+from utils.parsed_posting import ParsedPosting
+from utils.rate_limiter import TokenBucketLimiter
 
 # Logger configuration
 logger = logging.getLogger("JD_Scraper")
@@ -27,52 +31,98 @@ Actual implementations, patterns, and business logic have been
 modified or redacted to protect client confidentiality.
 """
 
+OPENAI_MODEL = "gpt-4o-mini"
+# budgeted per call until the real usage comes back
+EXPECTED_COMPLETION_TOKENS = 500
+
+_openai_client = None
+_openai_client_lock = threading.Lock()
+# Per-run token totals, aggregated by log_openai_usage
+openai_usage_totals = {"calls":0, "prompt_tokens":0, "cached_tokens":0, "completion_tokens":0}
+_openai_usage_lock = threading.Lock()
+# Shared across worker threads. Starts conservative and adopts the account's real limits from response headers.
+openai_rate_limiter = TokenBucketLimiter()
 
 def log_openai_usage(openai_api_response, prompt_header, company, dev_mode):
     if dev_mode == 0: # if defv mode is on, we aren't using the API, so no logs.
-        logger.info(f"[ company : {company} ] - [ prompt_type : {prompt_header} ] - [ prompt_tokens : {openai_api_response.prompt_tokens} ] - [ response_tokens : {openai_api_response.completion_tokens} ] - [ cached_tokens : {openai_api_response.prompt_tokens_details.cached_tokens} ]")
+        # batch results and some mock endpoints leave out the token details
+        details = openai_api_response.prompt_tokens_details
+        cached_tokens = details.cached_tokens if details is not None and details.cached_tokens is not None else 0
+        with _openai_usage_lock:
+            openai_usage_totals["calls"] += 1
+            openai_usage_totals["prompt_tokens"] += openai_api_response.prompt_tokens
+            openai_usage_totals["cached_tokens"] += cached_tokens
+            openai_usage_totals["completion_tokens"] += openai_api_response.completion_tokens
+        logger.info(f"[ company : {company} ] - [ prompt_type : {prompt_header} ] - [ prompt_tokens : {openai_api_response.prompt_tokens} ] - [ response_tokens : {openai_api_response.completion_tokens} ] - [ cached_tokens : {cached_tokens} ]")
+
+def openai_usage_summary() -> str:
+    """
+    Run totals from log_openai_usage, including how much of the prompt volume hit the provider's prefix cache.
+    """
+    with _openai_usage_lock:
+        totals = dict(openai_usage_totals)
+    hit_rate = totals["cached_tokens"]/totals["prompt_tokens"] if totals["prompt_tokens"] else 0.0
+    return (f"{totals['calls']} calls, {totals['prompt_tokens']} prompt tokens "
+        f"({totals['cached_tokens']} cached, {hit_rate:.1%} prefix-cache hit rate), "
+        f"{totals['completion_tokens']} completion tokens")
+
+def get_openai_client() -> OpenAI:
+    """
+    One long-lived client for the whole run, so every prompt reuses its HTTP connection pool.
+    """
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(
+                api_key=OPENAI_API_KEY
+            )
+        return _openai_client
+
+def estimate_tokens(*texts:str) -> int:
+    # ~4 characters per token is close enough for pacing
+    return sum(len(text) for text in texts)//4
 
 @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(6))
-def run_prompt(sys_prompt:str,user_prompt:str, dev_mode:int=0)->str:
+def run_prompt(sys_prompt:str,user_prompt:str, dev_mode:int=0, json_mode:bool=False)->str:
     if dev_mode == 0:
-        client = OpenAI(
-                api_key=OPENAI_API_KEY
-            )
-        session = client.chat.completions.create(
-                        model="gpt-4o-mini",
+        client = get_openai_client()
+        # json_mode asks the model for a single JSON object (used for batched evaluations)
+        extra_args = {"response_format":{"type":"json_object"}} if json_mode else {}
+
+        estimated_tokens = estimate_tokens(sys_prompt, user_prompt) + EXPECTED_COMPLETION_TOKENS
+        openai_rate_limiter.acquire(estimated_tokens)
+        raw_response = client.chat.completions.with_raw_response.create(
+                        model=OPENAI_MODEL,
                         messages=[ { "role": "system", "content" : sys_prompt },
-                            {"role": "user", "content": user_prompt } ]
+                            {"role": "user", "content": user_prompt } ],
+                        **extra_args
                     )
+        openai_rate_limiter.update_from_headers(raw_response.headers)
+        session = raw_response.parse()
 
         message_response = session.choices[0].message.content
         usage_response = session.usage
+        openai_rate_limiter.settle(estimated_tokens, usage_response.total_tokens)
         ## print(usage_response)
         return message_response, usage_response
     else:
         return "This row processed in developer mode.", "No Usage"
 
 def count_bullets(html_string:str) -> int:
-    return (len(html_string)-len(html_string.replace("<li>","")))//4
-
-def gender_analysis(text:str, gender:str) -> int:
-
-    gendered_words = {
-        "masculine":[
-            "word_1","word_2","word_3"
-        ],
-        "feminine":[
-            "word_1","word_2","word_3"
-        ] 
-    } # Actual gender-coded word list redacted
+    return html_string.count("<li>")
 
-    text = text.lower()
-    words = text.split()
-    count = 0
+GENDERED_WORDS = {
+    "masculine":[
+        "word_1","word_2","word_3"
+    ],
+    "feminine":[
+        "word_1","word_2","word_3"
+    ] 
+} # Actual gender-coded word list redacted
+DEFAULT_GENDER_LEXICON = GenderLexicon(GENDERED_WORDS)
 
-    for word in words:
-        if word.startswith(tuple(gendered_words[gender])):
-            count+=1
-    return count
+def gender_analysis(text:str, gender:str, lexicon:GenderLexicon=DEFAULT_GENDER_LEXICON) -> int:
+    return lexicon.scan(text)["counts"][gender]
 
 def get_langtools_feedback(job_description_text):
     try:
@@ -94,18 +144,7 @@ def get_langtools_feedback(job_description_text):
     return spelling_mistakes, grammar_mistakes, langtools_evaluation['issues']
 
 def preprocess_description_text(jd_description):
-    try:
-        html = BeautifulSoup(jd_description["description"],features="lxml")
-        for strong_item in html.find_all(["strong","b","i"]):
-                strong_item.unwrap()
-        for div_item in html.find_all(["div","p"]):
-                div_item.smooth()
-
-        html_as_text = html.get_text("\n", strip=True)
-
-        return html_as_text
-    except:
-        return "unable to parse html"
+    return ParsedPosting(jd_description).text
 
 def get_xpath_text(element):
     return element[0].text
@@ -116,19 +155,35 @@ def get_untagged_html(element):
 def get_condensed_html(element):
     return condense_html(element[0].get_attribute('innerHTML'))
 
+def lxml_inner_html(element) -> str:
+    """
+    lxml equivalent of Selenium's get_attribute('innerHTML').
+    element.text is already unescaped, so it's escaped again here; children (and their tails) come escaped from tostring.
+    """
+    return escape(element.text or "", quote=False) + "".join(html.tostring(child, encoding="unicode") for child in element)
+
+def get_lxml_text(element):
+    return element[0].text_content().strip()
+
+def get_lxml_untagged_html(element):
+    return untag_html(lxml_inner_html(element[0]))
+
+def get_lxml_condensed_html(element):
+    return condense_html(lxml_inner_html(element[0]))
+
+# lxml stand-ins for the Selenium extractors referenced in scraper_configs, for pages fetched without a browser
+LXML_EXTRACTORS = {
+    get_xpath_text:get_lxml_text,
+    get_untagged_html:get_lxml_untagged_html,
+    get_condensed_html:get_lxml_condensed_html,
+}
+
 def condense_html(raw_html : str) -> str:
     """
     Minify and clean the HTML content, stripping unnecessary comments, whitespace, and elements like JavaScript and style tags.
+    Uses the shared minifier / cleaner in utils.html_condenser (see condense_many there for bulk work).
     """
-    if not raw_html:
-        return ""
-
-    minified = htmlmin.minify(raw_html,remove_comments=True,reduce_boolean_attributes=True)
-    cleaner = Cleaner()
-    cleaner.javascript = True 
-    cleaner.style = True
-    
-    return cleaner.clean_html(minified)
+    return condense(raw_html)
 
 def untag_html(html: str) -> str:
     """
@@ -153,24 +208,10 @@ def untag_html(html: str) -> str:
 
     return plain_text
 
-def save_checkpoint(last_scraped_url, latest_scrape_data):
-    with open('checkpoint.json', 'w') as f:
-        json.dump({"last_scraped": last_scraped_url}, f)
-    with open('data_checkpoint.json','w') as f:
-        json.dump({"payload": latest_scrape_data}, f)
-
-def load_checkpoint():
-    try:
-        with open('checkpoint.json', 'r') as f:
-            data = json.load(f)
-            return data.get("last_scraped", None)
-    except FileNotFoundError:
-        return None
-
-def load_checkpoint_data():
-    try:
-        with open('data_checkpoint.json', 'r') as f:
-            data = json.load(f)
-            return data.get("payload", None)
-    except FileNotFoundError:
-        return None
\ No newline at end of file
+def json_default(value):
+    """
+    json.dump fallback for the numpy/pandas scalars that ride along in manifest rows.
+    """
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
@@ -0,0 +1,116 @@
+# Standard library imports
+import threading
+
+# Third-party imports
+from selenium.common.exceptions import WebDriverException
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class BrowserPool():
+    """
+    One lazily started browser per thread, with lifecycle management.
+        - Nothing starts until a thread first asks for a browser.
+        - checkout() is called once per page. After max_pages pages the browser is
+          recycled (quit and replaced) to bound memory growth over long runs.
+        - checkout() also health-checks the browser, and one that has crashed or
+          lost its session is replaced before the next page.
+        - Every clear_cookies_every pages, checkout() clears the browser's cookies.
+          Each thread does this for its own browser, so it works with any number of workers.
+        - quit_all() shuts down every browser the pool started. Threads that ask
+          again afterwards get a fresh one.
+    start_browser is a zero-argument callable returning a new WebDriver.
+    """
+    def __init__(self, start_browser, max_pages:int=200, clear_cookies_every:int=10):
+        self.start_browser = start_browser
+        self.max_pages = max_pages
+        self.clear_cookies_every = max(1, clear_cookies_every)
+        self.started = 0
+        self.recycled = 0
+        self.restarted = 0
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._drivers = []
+        # bumped by quit_all so threads drop references to browsers that were shut down
+        self._generation = 0
+
+    def _slot(self):
+        slot = getattr(self._local, "slot", None)
+        if slot is None or slot["generation"] != self._generation:
+            return None
+        return slot
+
+    def driver(self):
+        '''The calling thread's browser, started on first use.'''
+        slot = self._slot()
+        if slot is None:
+            driver = self.start_browser()
+            with self._lock:
+                self._drivers.append(driver)
+                self.started += 1
+                slot = {"driver":driver, "pages":0, "generation":self._generation}
+            self._local.slot = slot
+        return slot["driver"]
+
+    def checkout(self):
+        '''The calling thread's browser, ready for one more page.'''
+        slot = self._slot()
+        if slot is not None:
+            if slot["pages"] >= self.max_pages:
+                print(f"Recycling browser after {slot['pages']} pages")
+                self._replace(slot["driver"])
+                self.recycled += 1
+            elif not self._healthy(slot["driver"]):
+                print("Browser stopped responding; starting a new one")
+                self._replace(slot["driver"])
+                self.restarted += 1
+            elif slot["pages"] and slot["pages"] % self.clear_cookies_every == 0:
+                self._clear_cookies(slot["driver"])
+        driver = self.driver()
+        self._local.slot["pages"] += 1
+        return driver
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _clear_cookies(driver) -> None:
+        try:
+            driver.delete_all_cookies()
+        except WebDriverException as e:
+            print(f"Couldn't clear browser cookies: {e}")
+
+    def _replace(self, driver) -> None:
+        '''Quit the calling thread's browser; the next driver() call starts a new one.'''
+        self._quit(driver)
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        self._local.slot = None
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Couldn't close browser: {e}")
+
+    def quit_all(self) -> None:
+        with self._lock:
+            drivers = self._drivers
+            self._drivers = []
+            self._generation += 1
+        for driver in drivers:
+            self._quit(driver)
+
+    def stats(self) -> dict:
+        return {"started":self.started, "recycled":self.recycled, "restarted":self.restarted}
@@ -0,0 +1,76 @@
+# Standard library imports
+import glob
+import json
+import os
+import re
+
+# Local application imports
+from utils.base_utils import json_default
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class CheckpointLog():
+    """
+    Append-only checkpoint of finished rows, one JSON line per row:
+        {"url": ..., "row": [...]}
+
+    Only the new row is written each time, so checkpointing stays O(1) per row no matter
+    how large the run gets. Lines are flushed and fsync'd every fsync_every rows, so a crash
+    loses at most that many rows. Files are named per company and date, so concurrent runs
+    of different scrapers never write to the same checkpoint.
+    """
+    def __init__(self, company:str, date:str, directory:str="checkpoints", fsync_every:int=25):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{company}_{date}_checkpoint.jsonl")
+        self.fsync_every = fsync_every
+        # rows already in the file, from an earlier run today
+        self.logged_urls = set(self.load(self.path))
+        self._pending = 0
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def append(self, url:str, row:list) -> None:
+        self._file.write(json.dumps({"url":url, "row":row}, default=json_default) + "\n")
+        self.logged_urls.add(url)
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    @staticmethod
+    def latest_path(company:str, directory:str="checkpoints"):
+        '''Most recent checkpoint file for a company, or None if it has never been checkpointed.
+        Only dated scrape checkpoints count, so a replay's ({company}_reanalyzed_...) is never picked up.'''
+        dated = re.compile(re.escape(company) + r"_\d{4}-\d{2}-\d{2}_checkpoint\.jsonl")
+        paths = sorted(path for path in glob.glob(os.path.join(directory, f"{company}_*_checkpoint.jsonl"))
+            if dated.fullmatch(os.path.basename(path)))
+        return paths[-1] if paths else None
+
+    @staticmethod
+    def load(path:str) -> dict[str,list]:
+        '''Read a checkpoint back as url -> row, in the order the rows were written.
+        A torn final line (from a crash mid-write) is ignored.'''
+        rows = {}
+        if path is None or not os.path.exists(path):
+            return rows
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Ignoring unreadable checkpoint line in {path}")
+                    continue
+                rows[entry["url"]] = entry["row"]
+        return rows
@@ -0,0 +1,67 @@
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+_TERMS = object() # trie node key holding [(gender, stem), ...] for stems ending at that node
+
+class GenderLexicon():
+    """
+    Compiled gender-coded word lists.
+
+    A word counts as gender-coded when it starts with one of that gender's stems
+    (so "compet" catches "competitive" and "competition"). All stems for every
+    gender go into one character trie. Each word in the text is walked down the trie
+    once, so scanning costs the same whether the lists hold ten stems or ten thousand.
+    """
+    def __init__(self, word_lists:dict[str,list[str]]):
+        self.genders = list(word_lists.keys())
+        self._trie = {}
+        for gender, stems in word_lists.items():
+            for stem in stems:
+                stem = stem.strip().lower()
+                if not stem:
+                    continue
+                node = self._trie
+                for char in stem:
+                    node = node.setdefault(char, {})
+                node.setdefault(_TERMS, []).append((gender, stem))
+
+    @classmethod
+    def from_files(cls, **paths:str):
+        '''Load externally maintained lists, one stem per line, e.g. from_files(masculine="m.txt", feminine="f.txt").
+        Blank lines and lines starting with # are ignored.'''
+        word_lists = {}
+        for gender, path in paths.items():
+            with open(path, 'r', encoding='utf-8') as f:
+                word_lists[gender] = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        return cls(word_lists)
+
+    def scan(self, text:str) -> dict:
+        """
+        Score every gender in one pass over the text.
+        Returns {"counts": {gender: words matched}, "hits": {gender: {stem: words matched}}}.
+        A word matched by several stems of one gender counts once toward that gender's total.
+        """
+        return self.scan_tokens(text.lower().split())
+
+    def scan_tokens(self, words:list[str]) -> dict:
+        '''scan() for text that's already been lowercased and split into words.'''
+        counts = {gender:0 for gender in self.genders}
+        hits = {gender:{} for gender in self.genders}
+
+        for word in words:
+            node = self._trie
+            matched_genders = set()
+            for char in word:
+                node = node.get(char)
+                if node is None:
+                    break
+                for gender, stem in node.get(_TERMS, ()):
+                    hits[gender][stem] = hits[gender].get(stem, 0) + 1
+                    matched_genders.add(gender)
+            for gender in matched_genders:
+                counts[gender] += 1
+
+        return {"counts":counts, "hits":hits}
@@ -0,0 +1,53 @@
+# Standard library imports
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party imports
+import htmlmin
+from lxml.html.clean import Cleaner
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+# Configured once per process. The Cleaner keeps no per-call state, so every thread can share it.
+# A Minifier holds its parser between calls, so each thread gets its own.
+_cleaner = Cleaner(javascript=True, style=True)
+_minifiers = threading.local()
+
+def _minifier() -> htmlmin.Minifier:
+    minifier = getattr(_minifiers, "minifier", None)
+    if minifier is None:
+        minifier = htmlmin.Minifier(remove_comments=True, reduce_boolean_attributes=True)
+        _minifiers.minifier = minifier
+    return minifier
+
+def condense(raw_html:str) -> str:
+    """
+    Minify and clean the HTML content, stripping unnecessary comments, whitespace, and elements like JavaScript and style tags.
+    """
+    if not raw_html:
+        return ""
+    return _cleaner.clean_html(_minifier().minify(raw_html))
+
+def _condense_chunk(fragments:list[str]) -> list[str]:
+    return [condense(fragment) for fragment in fragments]
+
+def condense_many(fragments:list[str], processes:int=1, chunk_size:int=64) -> list[str]:
+    """
+    Condense a list of HTML fragments, in order (e.g. when reprocessing archived pages offline).
+    With processes > 1 the fragments are split into chunks of chunk_size and condensed in a
+    process pool. Each worker process builds its own minifier and cleaner once, and then reuses them.
+    """
+    fragments = list(fragments)
+    if processes <= 1 or len(fragments) <= chunk_size:
+        return _condense_chunk(fragments)
+
+    chunks = [fragments[i:i+chunk_size] for i in range(0, len(fragments), chunk_size)]
+    condensed = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for chunk in pool.map(_condense_chunk, chunks):
+            condensed.extend(chunk)
+    return condensed
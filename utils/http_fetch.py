@@ -0,0 +1,67 @@
+# Standard library imports
+import asyncio
+import threading
+
+# Third-party imports
+import httpx
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class HttpPageFetcher():
+    """
+    Fetch server-rendered job pages without a browser.
+
+    One pooled httpx.AsyncClient lives on an event loop in a background thread,
+    so connections are reused for the whole run and any thread (the main loop or
+    a worker) can hand it urls. fetch_many() pulls a batch of pages concurrently,
+    bounded by max_concurrency.
+    Pages come back as the raw response bytes, so lxml can honour the document's own
+    encoding declaration. Failed fetches come back as None so the caller can skip the row.
+    """
+    def __init__(self, max_concurrency:int=16, timeout:float=30, headers:dict=None):
+        self.max_concurrency = max_concurrency
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="http_fetcher", daemon=True)
+        self._thread.start()
+
+        async def _setup():
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                timeout=timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+            )
+        self._run(_setup())
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _fetch(self, url:str):
+        async with self._semaphore:
+            try:
+                response = await self._client.get(url)
+                response.raise_for_status()
+                return response.content
+            except httpx.HTTPError as e:
+                print(f"Couldn't fetch {url}: {e}")
+                return None
+
+    async def _fetch_many(self, urls:list[str]):
+        pages = await asyncio.gather(*(self._fetch(url) for url in urls))
+        return dict(zip(urls, pages))
+
+    def fetch(self, url:str):
+        return self._run(self._fetch(url))
+
+    def fetch_many(self, urls:list[str]) -> dict[str,bytes]:
+        return self._run(self._fetch_many(list(urls)))
+
+    def close(self) -> None:
+        self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
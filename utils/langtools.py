@@ -1,10 +1,12 @@
 # Standard library imports
-import json
+import threading
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 # Local application imports
 from constants import LANG_TOOLS_API_KEY, LANG_TOOLS_UNAME
@@ -15,21 +17,106 @@ Actual implementations, patterns, and business logic have been
 modified or redacted to protect client confidentiality.
 """
 
-def check_language(corpus:str):
-   
+HOSTED_CHECK_URL = "https://api.languagetoolplus.com/v2/check"
+DISABLED_RULES = "WHITESPACE_RULE, SENTENCE_WHITESPACE, SPACE_BEFORE_FINAL_PUNCTUATION_MARK, CONSECUTIVE_SPACES, CURRENCY_SPACE, COMMA_PARENTHESIS_WHITESPACE, APOS_SPACE_CONTRACTION"
+
+# Backend settings. "hosted" is the languagetoolplus API; "local" is a self-hosted
+# LanguageTool HTTP server (the JAR or Docker image), which has no rate limits.
+_config = {
+    "backend":"hosted",
+    "check_url":HOSTED_CHECK_URL,
+    "max_concurrency":4,
+    "max_text_length":20000,
+}
+_session = None
+_executor = None
+_setup_lock = threading.Lock()
+
+def configure_langtools(backend:str="hosted", server_url:str=None, max_concurrency:int=4, max_text_length:int=20000):
+    """
+    Point LanguageTool checks at the hosted API or a local server.
+    server_url is the local server's base url, e.g. http://localhost:8081
+    max_text_length should match the server's maxTextLength; longer texts are split into chunks.
+    """
+    global _session, _executor
+    assert backend in ["hosted","local"], f"LanguageTool backend '{backend}' not available. Options are ['hosted', 'local']"
+    assert backend == "hosted" or server_url, "A local LanguageTool backend needs a server_url"
+
+    with _setup_lock:
+        _config["backend"] = backend
+        _config["check_url"] = HOSTED_CHECK_URL if backend == "hosted" else server_url.rstrip("/") + "/v2/check"
+        _config["max_concurrency"] = max_concurrency
+        _config["max_text_length"] = max_text_length
+        # rebuild the pool on next use with the new settings
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _session = None
+        _executor = None
+
+def _get_pool():
+    '''Shared Session (connection pool sized to our concurrency) and the executor that bounds it.'''
+    global _session, _executor
+    with _setup_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_config["max_concurrency"])
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _executor = ThreadPoolExecutor(max_workers=_config["max_concurrency"], thread_name_prefix="langtools")
+        return _session, _executor
+
+def _split_text(corpus:str, max_length:int) -> list[tuple[int,str]]:
+    '''Split text into (offset, chunk) pieces no longer than max_length,
+    breaking at line ends where possible and at whitespace otherwise.'''
+    chunks = []
+    start = 0
+    while len(corpus) - start > max_length:
+        end = start + max_length
+        cut = corpus.rfind("\n", start, end)
+        if cut <= start:
+            cut = corpus.rfind(" ", start, end)
+        cut = end if cut <= start else cut + 1
+        chunks.append((start, corpus[start:cut]))
+        start = cut
+    chunks.append((start, corpus[start:]))
+    return chunks
+
+def _post_check(session, text:str) -> dict:
     payload = {
-        "text":corpus,
+        "text":text,
         "language":"auto",
-        "username":LANG_TOOLS_UNAME,
-        "apiKey":LANG_TOOLS_API_KEY,
-        "disabledRules":"WHITESPACE_RULE, SENTENCE_WHITESPACE, SPACE_BEFORE_FINAL_PUNCTUATION_MARK, CONSECUTIVE_SPACES, CURRENCY_SPACE, COMMA_PARENTHESIS_WHITESPACE, APOS_SPACE_CONTRACTION"
+        "disabledRules":DISABLED_RULES
     }
-    response = requests.post("https://api.languagetoolplus.com/v2/check", data=payload)
+    if _config["backend"] == "hosted":
+        payload["username"] = LANG_TOOLS_UNAME
+        payload["apiKey"] = LANG_TOOLS_API_KEY
+
+    response = session.post(_config["check_url"], data=payload)
     response.raise_for_status()
-    return response
+    return response.json()
+
+def check_language(corpus:str) -> dict:
+    """
+    Check a text against the configured LanguageTool backend.
+    Texts longer than the server's limit are checked as concurrent chunks and the
+    matches are merged back, with offsets relative to the full text.
+    """
+    session, executor = _get_pool()
+    chunks = _split_text(corpus, _config["max_text_length"])
+    futures = [(offset, executor.submit(_post_check, session, chunk)) for offset, chunk in chunks]
+
+    merged = None
+    for offset, future in futures:
+        payload = future.result()
+        for match in payload["matches"]:
+            match["offset"] += offset
+        if merged is None:
+            merged = payload
+        else:
+            merged["matches"].extend(payload["matches"])
+    return merged
 
-def process_langtools_response(response_obj) -> list[ str,list[str,str] ]:
-    payload = json.loads(response_obj.text)
+def process_langtools_response(payload:dict) -> list[ str,list[str,str] ]:
     issues = {} # [TYPE (shortMessage), CONTEXT OBJ (context:dict)]
     issue_context = []
 
@@ -0,0 +1,91 @@
+# Standard library imports
+import hashlib
+import json
+import os
+import time
+
+# Third-party imports
+from openai.types.chat import ChatCompletion
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATES = ["completed", "failed", "expired", "cancelled"]
+
+def build_batch_file(requests:list[dict], path:str) -> str:
+    """
+    Write chat completion requests to a Batch API input file.
+    Each request is {"custom_id": ..., "body": {model, messages, ...}}.
+    Returns a hash of the file contents, used to recognise a batch we already submitted.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            line = json.dumps({"custom_id":request["custom_id"],
+                "method":"POST",
+                "url":BATCH_ENDPOINT,
+                "body":request["body"]}) + "\n"
+            digest.update(line.encode("utf-8"))
+            f.write(line)
+    return digest.hexdigest()
+
+def submit_batch(client, path:str, input_hash:str, state_path:str) -> str:
+    """
+    Upload the input file and start a batch, unless this exact input was already submitted
+    (we remember the batch id in state_path), in which case we pick that batch back up.
+    """
+    if os.path.exists(state_path):
+        with open(state_path, 'r') as f:
+            state = json.load(f)
+        if state.get("input_hash") == input_hash:
+            print(f"Resuming previously submitted batch {state['batch_id']}")
+            return state["batch_id"]
+
+    with open(path, 'rb') as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h"
+    )
+    with open(state_path, 'w') as f:
+        json.dump({"input_hash":input_hash, "batch_id":batch.id}, f)
+    print(f"Submitted batch {batch.id} from {path}")
+    return batch.id
+
+def wait_for_batch(client, batch_id:str, poll_seconds:int=60, timeout_seconds:int=24*3600):
+    '''Poll until the batch reaches a terminal state (or we give up waiting).'''
+    started = time.monotonic()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        if counts is not None:
+            print(f"Batch {batch_id}: {batch.status} [{counts.completed}/{counts.total} done, {counts.failed} failed]")
+        if batch.status in TERMINAL_STATES:
+            return batch
+        if time.monotonic() - started > timeout_seconds:
+            print(f"Gave up waiting on batch {batch_id} after {timeout_seconds}s; it's still {batch.status}.")
+            return batch
+        time.sleep(poll_seconds)
+
+def read_batch_results(client, batch) -> dict[str,ChatCompletion]:
+    '''custom_id -> completion for every request that succeeded.'''
+    results = {}
+    if not batch.output_file_id:
+        return results
+
+    content = client.files.content(batch.output_file_id).text
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") == 200:
+            results[entry["custom_id"]] = ChatCompletion.model_validate(response["body"])
+        else:
+            print(f"Batch request {entry['custom_id']} failed: {entry.get('error') or response.get('status_code')}")
+    return results
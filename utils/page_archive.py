@@ -0,0 +1,151 @@
+# Standard library imports
+import glob
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Union
+
+# Third-party imports
+import pandas as pd
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class PageArchive():
+    """
+    Compressed, content-addressed store of the raw HTML fetched during one run:
+    archives/{company}_{date}_pages.sqlite.
+
+    Page bodies are zlib-compressed and keyed by their sha256, so a body shared by several
+    urls is stored once. The run's manifest is kept alongside the pages, which lets
+    `main.py --reanalyze` replay extraction and analysis with no browser or network.
+    Safe to share between worker threads.
+    """
+    def __init__(self, company:str=None, date:str=None, path:str=None, directory:str="archives", compression_level:int=6):
+        if path is None:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{company}_{date}_pages.sqlite")
+        self.path = path
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bodies (
+                hash TEXT PRIMARY KEY,
+                body BLOB NOT NULL
+            )""")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                raw INTEGER NOT NULL DEFAULT 0
+            )""")
+        # archives written before raw existed only hold decoded (str) pages
+        if "raw" not in self._columns("main"):
+            self._conn.execute("ALTER TABLE pages ADD COLUMN raw INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        if company is not None:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('company', ?)", (company,))
+        self._conn.commit()
+
+    @classmethod
+    def open(cls, path:str):
+        '''Open an existing archive for replay.'''
+        assert os.path.exists(path), f"No page archive at {path}"
+        return cls(path=path)
+
+    def _columns(self, schema:str) -> list[str]:
+        return [row[1] for row in self._conn.execute(f"PRAGMA {schema}.table_info(pages)")]
+
+    def put(self, url:str, page_source:Union[str,bytes]) -> str:
+        '''Store the HTML fetched for url: response bytes as they came off the wire, or a decoded
+        page (e.g. a browser's DOM) as UTF-8. Returns the body's hash.'''
+        raw = isinstance(page_source, bytes)
+        encoded = page_source if raw else page_source.encode("utf-8")
+        body_hash = hashlib.sha256(encoded).hexdigest()
+        compressed = zlib.compress(encoded, self.compression_level)
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO bodies (hash, body) VALUES (?, ?)", (body_hash, compressed))
+            self._conn.execute("INSERT OR REPLACE INTO pages (url, hash, fetched_at, raw) VALUES (?, ?, ?, ?)", (url, body_hash, time.time(), int(raw)))
+            self._conn.commit()
+        return body_hash
+
+    def get(self, url:str):
+        '''The archived HTML for url in the form it was put (bytes or str), or None if it was never fetched.'''
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT bodies.body, pages.raw FROM pages JOIN bodies ON pages.hash = bodies.hash WHERE pages.url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        body = zlib.decompress(row[0])
+        return body if row[1] else body.decode("utf-8")
+
+    def urls(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT url FROM pages")}
+
+    def copy_pages(self, source_path:str, urls:list[str]) -> int:
+        '''Copy the pages archived for urls in another archive (e.g. an earlier run's) into this one.
+        Pages already here are kept. Returns how many were copied.'''
+        with self._lock:
+            before = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            self._conn.execute("ATTACH DATABASE ? AS source", (source_path,))
+            try:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (url TEXT PRIMARY KEY)")
+                self._conn.execute("DELETE FROM wanted")
+                self._conn.executemany("INSERT OR IGNORE INTO wanted (url) VALUES (?)", ((url,) for url in urls))
+                self._conn.execute("""
+                    INSERT OR IGNORE INTO bodies (hash, body)
+                    SELECT source.bodies.hash, source.bodies.body FROM source.pages
+                    JOIN source.bodies ON source.pages.hash = source.bodies.hash
+                    WHERE source.pages.url IN (SELECT url FROM wanted)""")
+                raw = "raw" if "raw" in self._columns("source") else "0"
+                self._conn.execute(f"""
+                    INSERT OR IGNORE INTO pages (url, hash, fetched_at, raw)
+                    SELECT url, hash, fetched_at, {raw} FROM source.pages WHERE url IN (SELECT url FROM wanted)""")
+                self._conn.commit()
+            finally:
+                self._conn.execute("DETACH DATABASE source")
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] - before
+
+    @staticmethod
+    def earlier_archives(company:str, exclude_path:str, directory:str="archives") -> list[str]:
+        '''The company's other dated archives, newest first.'''
+        dated = re.compile(re.escape(company) + r"_\d{4}-\d{2}-\d{2}_pages\.sqlite")
+        paths = [path for path in glob.glob(os.path.join(directory, f"{company}_*_pages.sqlite"))
+            if dated.fullmatch(os.path.basename(path)) and os.path.abspath(path) != os.path.abspath(exclude_path)]
+        return sorted(paths, reverse=True)
+
+    def save_manifest(self, manifest_df:pd.DataFrame) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('manifest', ?)", (manifest_df.to_json(orient="split"),))
+            self._conn.commit()
+
+    def load_manifest(self) -> pd.DataFrame:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'manifest'").fetchone()
+        assert row is not None, f"{self.path} has no manifest to replay"
+        # keep values exactly as scraped (no date or dtype guessing)
+        return pd.read_json(io.StringIO(row[0]), orient="split", convert_dates=False, dtype=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            bodies, stored = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM bodies").fetchone()
+        return {"pages":pages, "unique_bodies":bodies, "compressed_bytes":stored}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
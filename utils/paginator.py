@@ -0,0 +1,100 @@
+# Standard library imports
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class DateWindowPaginator():
+    """
+    Pages through an offset/limit API whose results are sorted newest first, and yields
+    only the records dated inside a window.
+
+    fetch_page(offset, limit) returns one page as a list of records.
+    record_date(record) returns the record's date. It is called once per record read
+    (plus once per page probed by the boundary search).
+
+        - The next `prefetch` pages are requested while the current one is processed.
+        - When the window doesn't start at the newest record, the first page that reaches
+          back past `newest` is located with a galloping binary search, so the pages
+          before it are never read in full.
+        - Paging stops at the first record older than the window, or at a short page
+          (the end of the results).
+    Pages are fetched from a thread pool, so fetch_page must be safe to call concurrently.
+    """
+    def __init__(self, fetch_page, record_date, page_size:int=50, prefetch:int=2):
+        self.fetch_page = fetch_page
+        self.record_date = record_date
+        self.page_size = page_size
+        self.prefetch = max(1, prefetch)
+        self.requests = 0
+        # page number -> records, for pages the boundary search already fetched
+        self._pages = {}
+
+    def _fetch(self, page_number:int) -> list:
+        if page_number in self._pages:
+            return self._pages.pop(page_number)
+        self.requests += 1
+        return self.fetch_page(page_number*self.page_size, self.page_size)
+
+    def _probe(self, page_number:int) -> bool:
+        '''True when this page reaches back past newest (or past the end of the results).'''
+        page = self._fetch(page_number)
+        self._pages[page_number] = page
+        return not page or self.record_date(page[-1]) < self._newest
+
+    def _first_page(self) -> int:
+        '''First page holding a record dated before newest: gallop 1, 2, 4, ... then bisect.'''
+        if self._probe(0):
+            return 0
+        known_newer = 0
+        step = 1
+        while not self._probe(known_newer + step):
+            known_newer += step
+            step *= 2
+        low, high = known_newer, known_newer + step
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._probe(middle):
+                high = middle
+            else:
+                low = middle
+        # only the pages we'll go on to read are worth keeping
+        self._pages = {page_number:page for page_number, page in self._pages.items() if page_number >= high}
+        return high
+
+    def iter_window(self, oldest=None, newest=None):
+        """
+        Yield (record, date) for each record with oldest <= date < newest, newest first.
+        Either bound may be None for an open-ended window.
+        """
+        self._newest = newest
+        start = self._first_page() if newest is not None else 0
+
+        in_flight = deque()
+        next_page = start
+        with ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="paginator") as pool:
+            try:
+                while True:
+                    while len(in_flight) < self.prefetch:
+                        in_flight.append(pool.submit(self._fetch, next_page))
+                        next_page += 1
+
+                    page = in_flight.popleft().result()
+                    for record in page:
+                        date = self.record_date(record)
+                        if newest is not None and date >= newest:
+                            continue
+                        if oldest is not None and date < oldest:
+                            return
+                        yield record, date
+                    if len(page) < self.page_size:
+                        return
+            finally:
+                # pages past the end of the window aren't needed
+                for future in in_flight:
+                    future.cancel()
+                self._pages = {}
@@ -0,0 +1,139 @@
+# Standard library imports
+import glob
+import os
+
+# Third-party imports
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+COUNT_TYPE = pa.int32()
+LANGTOOLS_DETAIL_TYPE = pa.map_(pa.string(), COUNT_TYPE)                         # issue category -> count
+GENDERED_HITS_TYPE = pa.map_(pa.string(), pa.map_(pa.string(), COUNT_TYPE))     # gender -> stem -> count
+CATEGORY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+# Typed columns for the base analysis; anything else is typed from the first chunk written
+BASE_SCHEMA = {
+    "url":pa.string(),
+    "title":pa.string(),
+    "job_desc":pa.string(),
+    "job_info_raw":pa.string(),
+    "masculine_word_count":COUNT_TYPE,
+    "feminine_word_count":COUNT_TYPE,
+    "grammar_mistakes":COUNT_TYPE,
+    "spelling_mistakes":COUNT_TYPE,
+    "langtools_detail":LANGTOOLS_DETAIL_TYPE,
+    "bullet_point_count":COUNT_TYPE,
+    "count_of_duplicate_sentences":COUNT_TYPE,
+    "jd_structure_eval":pa.string(),
+    "salary_compliance":pa.string(),
+    "jd_text_eval":pa.string(),
+    "cx_eval_1":pa.string(),
+    "cx_eval_2":pa.string(),
+    "cx_eval_3":pa.string(),
+    "cx_eval_4":pa.string(),
+    "cx_eval_5":pa.string(),
+    "gendered_term_hits":GENDERED_HITS_TYPE,
+}
+
+# low-cardinality company columns, stored dictionary-encoded
+CATEGORICAL_COLUMNS = ["region", "role_type", "schedule_type"]
+
+def _missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (str, list, dict, tuple)):
+        return False
+    return bool(pd.isna(value))
+
+def _map_items(value, nested:bool=False):
+    '''dict -> [(key, value), ...] for a pyarrow map column. Anything that isn't a dict (e.g. a failed lookup) is null.'''
+    if not isinstance(value, dict):
+        return None
+    if nested:
+        return [(str(key), _map_items(inner)) for key, inner in value.items()]
+    return [(str(key), int(count)) for key, count in value.items() if not _missing(count)]
+
+def _to_array(values:list, arrow_type:pa.DataType) -> pa.Array:
+    if arrow_type == LANGTOOLS_DETAIL_TYPE:
+        return pa.array([_map_items(value) for value in values], type=arrow_type)
+    if arrow_type == GENDERED_HITS_TYPE:
+        return pa.array([_map_items(value, nested=True) for value in values], type=arrow_type)
+    if arrow_type == CATEGORY_TYPE:
+        return pa.array([None if _missing(value) else str(value) for value in values], type=pa.string()).dictionary_encode()
+    if pa.types.is_integer(arrow_type):
+        return pa.array([None if _missing(value) else int(value) for value in values], type=arrow_type)
+    if pa.types.is_floating(arrow_type):
+        return pa.array([None if _missing(value) else float(value) for value in values], type=arrow_type)
+    if pa.types.is_boolean(arrow_type):
+        return pa.array([None if _missing(value) else bool(value) for value in values], type=arrow_type)
+    return pa.array([None if _missing(value) else str(value) for value in values], type=pa.string())
+
+def _infer_type(column:str, series:pd.Series) -> pa.DataType:
+    if column in BASE_SCHEMA:
+        return BASE_SCHEMA[column]
+    if column in CATEGORICAL_COLUMNS:
+        return CATEGORY_TYPE
+    if pd.api.types.is_bool_dtype(series):
+        return pa.bool_()
+    if pd.api.types.is_integer_dtype(series):
+        return pa.int64()
+    if pd.api.types.is_float_dtype(series):
+        return pa.float64()
+    # manifest ids, dates and free text: keep them exactly as scraped
+    return pa.string()
+
+class ParquetPartitionWriter():
+    """
+    Writes a run's results as Parquet, hive-partitioned by company and scrape date:
+        {root}/company={company}/scrape_date={date}/part-0.parquet
+
+    Base-analysis columns have fixed types. langtools_detail and gendered_term_hits are
+    stored as maps instead of stringified dicts, and region/role_type/schedule_type are
+    dictionary-encoded. Other columns are typed from the first chunk written, and every
+    later chunk is converted to that schema. Each write() call adds one row group, so
+    rows can be streamed out in chunks. Rerunning the same company and date replaces
+    that day's partition.
+    """
+    def __init__(self, company:str, scrape_date:str, root:str="output/parquet", compression:str="zstd"):
+        self.directory = os.path.join(root, f"company={company}", f"scrape_date={scrape_date}")
+        os.makedirs(self.directory, exist_ok=True)
+        for stale_part in glob.glob(os.path.join(self.directory, "part-*.parquet")):
+            os.remove(stale_part)
+        self.path = os.path.join(self.directory, "part-0.parquet")
+        self.compression = compression
+        self.schema = None
+        self.rows_written = 0
+        self._writer = None
+
+    def _to_table(self, frame:pd.DataFrame) -> pa.Table:
+        # partition values live in the directory names, not in the file
+        frame = frame.drop(columns=[column for column in ["company", "scrape_date"] if column in frame])
+        if self.schema is None:
+            self.schema = pa.schema([pa.field(str(column), _infer_type(column, frame[column])) for column in frame.columns])
+
+        arrays = []
+        for field in self.schema:
+            values = frame[field.name].tolist() if field.name in frame else [None]*len(frame)
+            arrays.append(_to_array(values, field.type))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def write(self, frame:pd.DataFrame) -> None:
+        if frame.empty and self._writer is not None:
+            return
+        table = self._to_table(frame)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        self._writer.write_table(table)
+        self.rows_written += len(frame)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,63 @@
+# Standard library imports
+from functools import cached_property
+
+# Third-party imports
+import nltk
+from bs4 import BeautifulSoup
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class ParsedPosting():
+    """
+    One job description, parsed once.
+
+    The description HTML goes through BeautifulSoup a single time. Every view the analyses
+    need (preprocessed text, sentences, tokens, bullet count) is derived from that tree on
+    first use and memoized, so base and company analyses share the work.
+    """
+    def __init__(self, raw_job:dict):
+        self.raw_job = raw_job
+        self.html = raw_job.get("description") or ""
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        soup = BeautifulSoup(self.html, features="lxml")
+        # inline emphasis would otherwise split words across text nodes
+        for strong_item in soup.find_all(["strong","b","i"]):
+            strong_item.unwrap()
+        for div_item in soup.find_all(["div","p"]):
+            div_item.smooth()
+        return soup
+
+    @cached_property
+    def text(self) -> str:
+        '''Block-separated plain text, as fed to LanguageTool and the lexicon scans.'''
+        try:
+            return self.soup.get_text("\n", strip=True)
+        except:
+            return "unable to parse html"
+
+    @cached_property
+    def flat_text(self) -> str:
+        '''All text nodes run together (unwrapping and smoothing don't change this).'''
+        return self.soup.get_text()
+
+    @cached_property
+    def sentences(self) -> list[str]:
+        return nltk.sent_tokenize(self.flat_text)
+
+    @cached_property
+    def duplicate_sentence_count(self) -> int:
+        return len(self.sentences) - len(set(self.sentences))
+
+    @cached_property
+    def bullet_count(self) -> int:
+        return self.html.count("<li>")
+
+    @cached_property
+    def tokens(self) -> list[str]:
+        return self.text.lower().split()
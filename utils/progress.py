@@ -0,0 +1,129 @@
+# Standard library imports
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+PERCENTILES = [50, 90, 99]
+
+def _percentile(sorted_values:list[float], pct:int) -> float:
+    '''Nearest-rank percentile of an already sorted list.'''
+    rank = max(0, math.ceil(pct/100*len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+class ProgressReporter():
+    """
+    Run progress and throughput for one scrape.
+
+    Tracks rows finished (scraped, restored from a checkpoint or skipped), jobs/sec and
+    ETA, how long each stage takes per row (fetch, extract, langtools, openai) and
+    errors by type. report() prints a one-line summary and rewrites a JSON status file
+    that dashboards can poll. The file is replaced atomically, so a reader never sees
+    a half-written status. Stage timings may be recorded from worker threads.
+    """
+    def __init__(self, run_name:str, date:str, path:str=None, directory:str="status"):
+        if path is None:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{run_name}_{date}_status.json")
+        self.path = path
+        self.run_name = run_name
+        self.phase = "starting"
+        self.total = None
+        self.done = 0
+        self.restored = 0
+        self.skipped = 0
+        self.errors = Counter()
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self._stage_times = {}
+        # rows/sec only counts rows we actually worked on; restored rows are instant
+        self._work_started = None
+        self._worked = 0
+
+    def set_phase(self, phase:str, total:int=None) -> None:
+        '''Move to a new phase. Passing total (the rows to process) starts the throughput clock.'''
+        self.phase = phase
+        if total is not None:
+            self.total = total
+            self._work_started = time.monotonic()
+        self.report(log=False)
+
+    @contextmanager
+    def stage(self, name:str):
+        '''Time a block of per-row work: `with progress.stage("fetch"): ...`'''
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - started)
+
+    def record(self, name:str, seconds:float) -> None:
+        with self._lock:
+            self._stage_times.setdefault(name, []).append(seconds)
+
+    def error(self, kind:str) -> None:
+        with self._lock:
+            self.errors[kind] += 1
+
+    def row_done(self, restored:bool=False, skipped:bool=False) -> None:
+        self.done += 1
+        if restored:
+            self.restored += 1
+            return
+        self._worked += 1
+        if skipped:
+            self.skipped += 1
+
+    def status(self) -> dict:
+        rate = None
+        eta = None
+        if self._work_started is not None and self._worked:
+            elapsed = time.monotonic() - self._work_started
+            rate = self._worked / elapsed if elapsed > 0 else None
+            if rate and self.total is not None:
+                eta = max(0, self.total - self.done) / rate
+
+        with self._lock:
+            stages = {}
+            for name, times in self._stage_times.items():
+                ordered = sorted(times)
+                stages[name] = {"count":len(ordered), **{f"p{pct}":round(_percentile(ordered, pct), 3) for pct in PERCENTILES}}
+            errors = dict(self.errors)
+
+        return {"run":self.run_name,
+            "phase":self.phase,
+            "total":self.total,
+            "done":self.done,
+            "restored":self.restored,
+            "skipped":self.skipped,
+            "jobs_per_sec":round(rate, 3) if rate else None,
+            "eta_seconds":round(eta) if eta is not None else None,
+            "stage_seconds":stages,
+            "errors":errors,
+            "started_at":self.started_at,
+            "updated_at":time.time()}
+
+    def report(self, log:bool=True) -> dict:
+        status = self.status()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, self.path)
+
+        if log:
+            rate = f"{status['jobs_per_sec']:.2f} jobs/s" if status['jobs_per_sec'] else "-- jobs/s"
+            eta = f"ETA {status['eta_seconds']//60}m{status['eta_seconds']%60:02d}s" if status['eta_seconds'] is not None else "ETA --"
+            stages = ", ".join(f"{name} p50 {timing['p50']:.2f}s p90 {timing['p90']:.2f}s" for name, timing in status['stage_seconds'].items())
+            print(f"[{status['done']}/{status['total']}] {rate}, {eta}, {status['skipped']} skipped, "
+                f"{sum(status['errors'].values())} errors | {stages}")
+        return status
@@ -0,0 +1,70 @@
+# Standard library imports
+import threading
+import time
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+class TokenBucketLimiter():
+    """
+    Paces callers against both a requests-per-minute and a tokens-per-minute budget,
+    so concurrent workers slow down before the API starts answering with 429s.
+
+    Each bucket refills continuously at limit/60 per second. acquire() blocks until
+    both buckets can cover the call, then takes its share. After each response,
+    update_from_headers() adopts the limits the API reports and pulls our buckets
+    down to the API's own view of what is remaining. settle() corrects a token
+    estimate once the real usage is known.
+    """
+    def __init__(self, requests_per_minute:int=500, tokens_per_minute:int=200000):
+        self._lock = threading.Lock()
+        self.request_limit = requests_per_minute
+        self.token_limit = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self.throttled_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(self.request_limit, self._requests + elapsed*self.request_limit/60)
+        self._tokens = min(self.token_limit, self._tokens + elapsed*self.token_limit/60)
+
+    def acquire(self, tokens:int) -> None:
+        # a single call bigger than the whole budget only has to wait for a full bucket
+        tokens = min(tokens, self.token_limit)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max((1 - self._requests)*60/self.request_limit,
+                    (tokens - self._tokens)*60/self.token_limit,
+                    0.01)
+                self.throttled_seconds += wait
+            time.sleep(wait)
+
+    def settle(self, estimated_tokens:int, actual_tokens:int) -> None:
+        '''Give back (or take more of) the token budget once real usage is known.'''
+        with self._lock:
+            self._tokens = min(self.token_limit, self._tokens + estimated_tokens - actual_tokens)
+
+    def update_from_headers(self, headers) -> None:
+        '''Sync with x-ratelimit-* response headers.'''
+        with self._lock:
+            self._refill()
+            if headers.get("x-ratelimit-limit-requests"):
+                self.request_limit = int(headers["x-ratelimit-limit-requests"])
+            if headers.get("x-ratelimit-limit-tokens"):
+                self.token_limit = int(headers["x-ratelimit-limit-tokens"])
+            if headers.get("x-ratelimit-remaining-requests"):
+                self._requests = min(self._requests, float(headers["x-ratelimit-remaining-requests"]))
+            if headers.get("x-ratelimit-remaining-tokens"):
+                self._tokens = min(self._tokens, float(headers["x-ratelimit-remaining-tokens"]))
@@ -1,19 +1,24 @@
 # Standard library imports
 import datetime
 import gc
+import json
 import logging
+import os
 from logging.handlers import RotatingFileHandler
-import re
 import time
 import typing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
 import nltk
 import openai
 import pandas as pd
+from lxml import html
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from usp.tree import sitemap_tree_for_homepage
+from selenium.webdriver.support.ui import WebDriverWait
 
 # Local application imports
 from constants import *
@@ -26,6 +31,18 @@ logger.setLevel(logging.INFO)
 nltk.download("punkt_tab")
 
 from utils.base_utils import *
+from utils.browser_pool import BrowserPool
+from utils.checkpoint_log import CheckpointLog
+from utils.http_fetch import HttpPageFetcher
+from utils.openai_batch import build_batch_file, read_batch_results, submit_batch, wait_for_batch
+from utils.page_archive import PageArchive
+from utils.paginator import DateWindowPaginator
+from utils.parquet_output import ParquetPartitionWriter
+from utils.parsed_posting import ParsedPosting
+from utils.progress import ProgressReporter
+from utils.rule_engine import RuleEngine
+from utils.scrape_state import ScrapeStateStore, content_hash
+from utils.sitemap_stream import discover_sitemaps, iter_sitemap_urls, make_sitemap_session
 
 """
 NOTE: This code has been anonymized for portfolio purposes.
@@ -50,10 +67,46 @@ class ReportConstructor():
             > OpenAI evaluation
             > Regular Expressions
     Write out the payload and the errored url list.
+
+    With workers > 1 the per-JD process runs on a thread pool. Each worker
+    thread owns its own browser, and finished rows are stored in manifest order.
+    Browsers come from a BrowserPool: started on the first page that needs one,
+    recycled every browser_max_pages pages, and all shut down when process_jobs ends.
     """
-    def __init__(self, config_args:dict, checkpoint_url = None, dev_mode=0):
+    OPENAI_PROMPTS = {
+        "base":{
+            "jd_structure_eval":'PROPRIETARY EVAL QUERY',
+            "salary_compliance":'PROPRIETARY EVAL QUERY', 
+            "jd_text_eval":'PROPRIETARY EVAL QUERY',
+        },
+        "cx":{
+            "cx_eval_1":'PROPRIETARY EVAL QUERY', 
+            "cx_eval_2":"PROPRIETARY EVAL QUERY",
+            "cx_eval_3":'''PROPRIETARY EVAL QUERY''',
+            "cx_eval_4":'''PROPRIETARY EVAL QUERY''',
+            "cx_eval_5":'''PROPRIETARY EVAL QUERY''',
+        }
+    }
+    # Every request for a posting opens with this same system message, so the provider can
+    # cache it as a prompt prefix across all 8 questions. Mode framing rides with each question.
+    OPENAI_SYSTEM_MESSAGE = 'Consider this job description: {job_description}'
+    OPENAI_MODE_FRAMING = {
+        "base":"", # OpenAI prompts we run for everyone.
+        "cx":"Answer as a job candidate reviewing this job description for an open role. " # [C]andidate e[X]perience -- prompts geared toward talent attraction.
+    }
+
+    # manifest column that tells us whether a posting changed since the last run
+    freshness_column = "last_modified"
+    # seconds _wait_for_page will wait for a page to be ready, unless the site config sets wait_timeout
+    default_wait_timeout = 5
+    # rows in flight per worker; bounds how many finished rows can wait on a slower earlier one
+    worker_window = 4
+
+    def __init__(self, config_args:dict, checkpoint_url = None, dev_mode=0, workers=1, batch_prompts=0, analysis_cache=None, incremental=0, checkpoint_data=None, deferred_analysis=0, prompt_concurrency=1, gender_lexicon=None, archive_pages=0, reanalyze=None, status_every=10, status_path=None, parquet_dir=None, output_buffer_rows=200):
         self.TODAYS_DATE = datetime.datetime.now().strftime("%Y-%m-%d")
         self.checkpoint_url = checkpoint_url
+        # url -> finished row from the checkpoint we're resuming; these urls are not processed again
+        self.checkpoint_data = checkpoint_data or {}
         self.caught_up_to_checkpoint = False
         self.headers = BASE_HEADERS
         self.domain = config_args['domain']
@@ -61,43 +114,103 @@ class ReportConstructor():
         self.sitemap_job_pattern = config_args['job_pattern']
         self.sitemap_id_pattern = config_args['id_pattern']
         self.company_name = config_args['name']
+        self.gender_lexicon = gender_lexicon or DEFAULT_GENDER_LEXICON
+        # company-specific regex checks, compiled once
+        self.rule_engine = RuleEngine(config_args.get('rules', []))
+        # child sitemaps fetched in parallel when following a sitemap index
+        self.sitemap_workers = config_args.get('sitemap_workers', 8)
         self.dev_mode = dev_mode
-
-        self._start_browser()
+        # "browser" (default) renders pages in Selenium; "http" fetches server-rendered pages directly
+        self.fetch_mode = config_args.get('fetch_mode', 'browser')
+        # replaying an archived run: pages come from the archive and nothing is fetched
+        self.replay_archive = PageArchive.open(reanalyze) if reanalyze else None
+        if self.replay_archive is not None:
+            self.fetch_mode = "archive"
+        # keep the raw HTML of every fetched page so analysis can be re-run offline
+        self.page_archive = PageArchive(self.company_name, self.TODAYS_DATE) if archive_pages and self.replay_archive is None else None
+        # replays write their own output files so they never clobber the scraped run's
+        self.run_name = f"{self.company_name}_reanalyzed" if self.replay_archive is not None else self.company_name
+        self.workers = max(1, workers)
+        # page readiness: "xpaths" (required XPaths present), "ready_state" or "network_idle"
+        self.wait_strategy = config_args.get('wait_strategy', 'xpaths')
+        self.wait_timeout = config_args.get('wait_timeout', self.default_wait_timeout)
+        self.wait_times = []
+        self.wait_timeouts = 0
+        self.batch_prompts = batch_prompts
+        self.analysis_cache = analysis_cache
+        # leave OpenAI columns empty while scraping and fill them from one Batch API job at the end
+        self.deferred_analysis = deferred_analysis
+        self.batch_poll_seconds = 60
+        # questions per posting sent in parallel once the shared prompt prefix is warm
+        self.prompt_concurrency = max(1, prompt_concurrency)
+        # carrying rows forward would defeat a replay, so incremental mode only applies to real scrapes
+        self.scrape_state = ScrapeStateStore(self.company_name, headers=BASE_HEADERS) if incremental and self.replay_archive is None else None
+        self._page_hashes = {}
+
+        # browsers are per-thread so concurrent workers never share a session, and start on first use
+        self.browser_pool = BrowserPool(self._start_browser,
+            max_pages=config_args.get('browser_max_pages', 200),
+            clear_cookies_every=config_args.get('browser_clear_cookies_every', 10))
+
+        self.http_fetcher = None
+        self._prefetched_pages = {}
+        if self.fetch_mode == "http":
+            self.http_prefetch = config_args.get('http_prefetch', 25)
+            self.http_fetcher = HttpPageFetcher(
+                max_concurrency=config_args.get('http_concurrency', 16),
+                timeout=config_args.get('http_timeout', 30),
+                headers=config_args.get('http_headers')
+            )
+        self.checkpoint_log = CheckpointLog(self.run_name, self.TODAYS_DATE)
+        # throughput, ETA and stage latencies: logged every status_every rows and kept in a JSON status file
+        self.progress = ProgressReporter(self.run_name, self.TODAYS_DATE, path=status_path)
+        self.status_every = max(1, status_every)
+        # typed, partitioned Parquet copy of the output, written next to the CSV
+        self.parquet_dir = parquet_dir
+        # finished rows are written out every output_buffer_rows rows instead of being held until the end
+        self.output_buffer_rows = max(1, output_buffer_rows)
+        self.output_path = f"{self.run_name}_merged_table_{self.TODAYS_DATE}.csv"
+        self.parquet_writer = None
+        self.rows_written = 0
+        self._output_columns = None
+        # finished rows waiting to be written (all of them in deferred mode, which fills them in at the end)
         self.processed_data = []
+        self.processed_index = []
         self.skipped_urls = []
 
+    @property
+    def browser(self):
+        '''The calling thread's browser, started on first use.'''
+        return self.browser_pool.driver()
+
     def _scrape_sitemap(self):
-        tree = sitemap_tree_for_homepage(self.domain)
-        data = []
-
-        for page in tree.all_pages():
-            print(f"scraping page {page}")
-            req_id = None
-            # print(page.url)
-            # print(f"matching on: {self.sitemap_id_pattern}")
-            if match := re.search(self.sitemap_id_pattern, page.url):
-                req_id = match.group(1)
-            if re.search(self.sitemap_job_pattern, page.url): 
-            # and not(req_id in dedupe_on.values):
-                data.append([page.url, page.last_modified])
-        return data
+        '''Stream the site's sitemap(s), following sitemap indexes, and yield [url, lastmod] for every job url.'''
+        session = make_sitemap_session(self.sitemap_workers)
+        for url, last_modified in iter_sitemap_urls(discover_sitemaps(self.domain, session),
+                job_pattern=self.sitemap_job_pattern,
+                session=session,
+                max_workers=self.sitemap_workers):
+            yield [url, last_modified]
 
     def _process_sitemap(self) -> None:
-        # surpress warning and info messages coming from USP
-        logging.getLogger("usp.fetch_parse").setLevel(logging.CRITICAL)
-        logging.getLogger("usp.helpers").setLevel(logging.ERROR)
-        logging.getLogger("usp.tree").setLevel(logging.ERROR)
-
         print(f"| --- Scraping the {self.domain} sitemap for job descriptions --- |")
 
-        output_df = pd.DataFrame(self._get_sitemap_urls(), columns=['url', 'last_modified'])
-        output_df['last_modified'] = str(output_df['last_modified'][0])[:10]
+        output_df = pd.DataFrame(list(self._scrape_sitemap()), columns=['url', 'last_modified'])
+        # keep each url's own lastmod (YYYY-MM-DD); incremental runs compare against it
+        output_df['last_modified'] = output_df['last_modified'].map(lambda lastmod: str(lastmod)[:10] if not pd.isna(lastmod) else None)
         self.manifest_df = output_df
         self.job_counter = 0
         self.num_jobs = len(self.manifest_df['url'])
         print(f"| --- Found {self.num_jobs} Job Descriptions --- |")
 
+    def _load_archived_manifest(self) -> None:
+        '''Stand-in for _process_sitemap when replaying: the manifest is the one saved with the archive.'''
+        print(f"| --- Replaying pages archived in {self.replay_archive.path} --- |")
+        self.manifest_df = self.replay_archive.load_manifest()
+        self.job_counter = 0
+        self.num_jobs = len(self.manifest_df['url'])
+        print(f"| --- Found {self.num_jobs} Job Descriptions --- |")
+
     def _process_jd_checkpoint_update(self, url):
         if url == self.checkpoint_url:
             self.caught_up_to_checkpoint = True
@@ -105,197 +218,647 @@ class ReportConstructor():
             print(f"caught up at job number {self.job_counter+1}: {url}")
         # self.job_counter+=1
 
-    def _jd_update_status(self):
-        print(f"Successfully scraped [{self.job_counter}/{self.num_jobs}] job descrtiptions.")
-        self.browser.delete_all_cookies()
+    def _update_jd_status(self):
+        self.progress.report()
+        # cookies are cleared by each browser's own thread, in BrowserPool.checkout
         gc.collect()
 
     def _process_job_descriptions(self):
-        for idx, scrape_row in self.manifest_df.iterrows() :
-            try:
+        # (index, namedtuple) pairs: attribute access like a Series row, without building a Series per row
+        rows = list(zip(self.manifest_df.index, self.manifest_df.itertuples(index=False)))
+        restored = sum(scrape_row.url in self.checkpoint_data for idx, scrape_row in rows)
+        if restored:
+            print(f"| --- Restoring {restored} rows from the checkpoint; they won't be scraped again --- |")
+
+        if self.workers == 1:
+            for idx, scrape_row in self._prefetch_rows(rows):
                 # Check for checkpoint
                 if self.checkpoint_url != None and self.caught_up_to_checkpoint == False:
                     self._process_jd_checkpoint_update(scrape_row.url)
-
-                # Print a status update
-                if self.job_counter%10 == 0 and self.job_counter!=0:
-                    self._update_jd_status()
-
-                # Run basic processing
-                raw_job = self._scrape_url(scrape_row.url)
-                base_analysis = self._run_base_analysis(raw_job)
-
-                # store the results of the base analysis
-                row_data_list = [scrape_row.url,
-                    raw_job['title'],
-                    raw_job['description'],
-                    raw_job['meta'],
-                    base_analysis['masculine_count'],
-                    base_analysis['feminine_count'],
-                    base_analysis['grammar_mistakes'],
-                    base_analysis['spelling_mistakes'],
-                    base_analysis['langtools_detail'],
-                    base_analysis['bullet_point_count'],
-                    base_analysis['duplicate_sentences_count'],
-                    base_analysis['open_ai_base']["jd_structure_eval"],
-                    base_analysis['open_ai_base']["salary_compliance"],
-                    base_analysis['open_ai_base']["jd_text_eval"],
-                    base_analysis['open_ai_cx']["cx_eval_1"],
-                    base_analysis['open_ai_cx']["cx_eval_2"],
-                    base_analysis['open_ai_cx']["cx_eval_3"],
-                    base_analysis['open_ai_cx']["cx_eval_4"],
-                    base_analysis['open_ai_cx']["cx_eval_5"]
-                ]
-                
-                # Process JD with company-specific requirements
-                row_data_list.extend(self._extend_with_company_analysis(scrape_row,row_data_list))
-                # print(row_data_list)
-                # Write all this data to list outside the loop
-                self.processed_data.append(row_data_list)
-                self.job_counter+=1
-                last_scraped_url = scrape_row.url
-                save_checkpoint(last_scraped_url, self.processed_data)
-            except Exception as e:
-                self.skipped_urls.append(scrape_row.url)
-                print(f"skipped! Error: {e}")
-                continue
+                if scrape_row.url in self.checkpoint_data:
+                    # once stored, the restored row is only needed in the output buffer
+                    self._store_job_row(idx, scrape_row, self.checkpoint_data.pop(scrape_row.url), restored=True)
+                else:
+                    self._store_job_row(idx, scrape_row, self._process_job_row(scrape_row))
+            return
+
+        print(f"| --- Processing with {self.workers} workers --- |")
+        # submit through a bounded window rather than all at once, so memory stays bounded too
+        window = self.workers*self.worker_window
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jd_worker") as pool:
+            for idx, scrape_row in rows:
+                # checkpointed rows never reach the pool
+                restored_row = self.checkpoint_data.pop(scrape_row.url, None)
+                future = pool.submit(self._process_job_row, scrape_row) if restored_row is None else None
+                in_flight.append((idx, scrape_row, future, restored_row))
+                if len(in_flight) >= window:
+                    self._collect_job_row(*in_flight.popleft())
+            while in_flight:
+                self._collect_job_row(*in_flight.popleft())
+
+        # the worker threads are gone, so nothing can reach their browsers any more
+        self.browser_pool.quit_all()
+
+    def _collect_job_row(self, idx, scrape_row, future, restored_row) -> None:
+        '''Store a row from the worker window. Rows are collected in submission order, so processed_data stays in manifest order.'''
+        if self.checkpoint_url != None and self.caught_up_to_checkpoint == False:
+            self._process_jd_checkpoint_update(scrape_row.url)
+        if future is None:
+            self._store_job_row(idx, scrape_row, restored_row, restored=True)
+        else:
+            self._store_job_row(idx, scrape_row, future.result())
+
+    def _needs_fetch(self, scrape_row) -> bool:
+        '''False when the row will be restored from the checkpoint or carried forward unchanged.'''
+        if scrape_row.url in self.checkpoint_data:
+            return False
+        if self.scrape_state is not None:
+            return self.scrape_state.unchanged_row(scrape_row.url, getattr(scrape_row, self.freshness_column, None)) is None
+        return True
+
+    def _prefetch_rows(self, rows):
+        '''In http fetch mode, pull the next chunk of pages concurrently before handing its rows out.
+        Concurrent workers fetch their own pages through the shared client instead.'''
+        if self.http_fetcher is None:
+            yield from rows
+            return
+
+        for start in range(0, len(rows), self.http_prefetch):
+            chunk = rows[start:start+self.http_prefetch]
+            urls = [scrape_row.url for idx, scrape_row in chunk if self._needs_fetch(scrape_row)]
+            # a whole chunk is fetched concurrently, so this is timed per chunk rather than per page
+            with self.progress.stage("prefetch"):
+                self._prefetched_pages.update(self.http_fetcher.fetch_many(urls))
+            yield from chunk
+
+    def _process_job_row(self, scrape_row):
+        '''Scrape and analyze a single manifest row.
+        Returns the finished row, or None if the row had to be skipped.
+        Safe to call from worker threads.'''
+        try:
+            # Incremental runs carry the prior row forward if the url hasn't changed
+            if self.scrape_state is not None:
+                prior_row = self.scrape_state.unchanged_row(scrape_row.url, getattr(scrape_row, self.freshness_column, None))
+                if prior_row is not None:
+                    print(f"unchanged since last run, carrying forward: {scrape_row.url}")
+                    self._page_hashes[scrape_row.url] = self.scrape_state.content_hash_for(scrape_row.url)
+                    return prior_row
+
+            # Run basic processing
+            raw_job = self._scrape_url(scrape_row.url)
+
+            # no freshness signal (or it moved) but the page itself may still be identical
+            if self.scrape_state is not None:
+                page_hash = content_hash(raw_job)
+                self._page_hashes[scrape_row.url] = page_hash
+                prior_row = self.scrape_state.same_content_row(scrape_row.url, page_hash)
+                if prior_row is not None:
+                    print(f"content unchanged since last run, carrying forward: {scrape_row.url}")
+                    return prior_row
+
+            # parse the description once; every base analysis reads from it
+            posting = ParsedPosting(raw_job)
+            base_analysis = self._run_base_analysis(raw_job, posting)
+
+            # store the results of the base analysis
+            row_data_list = [scrape_row.url,
+                raw_job['title'],
+                raw_job['description'],
+                raw_job['meta'],
+                base_analysis['masculine_count'],
+                base_analysis['feminine_count'],
+                base_analysis['grammar_mistakes'],
+                base_analysis['spelling_mistakes'],
+                base_analysis['langtools_detail'],
+                base_analysis['bullet_point_count'],
+                base_analysis['duplicate_sentences_count'],
+                base_analysis['open_ai_base']["jd_structure_eval"],
+                base_analysis['open_ai_base']["salary_compliance"],
+                base_analysis['open_ai_base']["jd_text_eval"],
+                base_analysis['open_ai_cx']["cx_eval_1"],
+                base_analysis['open_ai_cx']["cx_eval_2"],
+                base_analysis['open_ai_cx']["cx_eval_3"],
+                base_analysis['open_ai_cx']["cx_eval_4"],
+                base_analysis['open_ai_cx']["cx_eval_5"],
+                base_analysis['gendered_term_hits']
+            ]
+            # company-specific analysis runs over the whole frame in post-processing
+            return row_data_list
+        except Exception as e:
+            print(f"skipped! Error: {e}")
+            self.progress.error(type(e).__name__)
+            return None
+
+    def _store_job_row(self, idx, scrape_row, row_data_list, restored=False):
+        '''Record a finished row (or a skip). Always called from the main thread, in manifest order.
+        Restored rows came from the checkpoint we resumed from.'''
+        self.progress.row_done(restored=restored, skipped=row_data_list is None)
+        # Print a status update (progress.done moves on every row, skips included, so this fires once per interval)
+        if self.progress.done%self.status_every == 0:
+            self._update_jd_status()
+
+        if row_data_list is None:
+            self.skipped_urls.append(scrape_row.url)
+            return
+
+        # Write all this data to list outside the loop
+        self.processed_data.append(row_data_list)
+        # keep the manifest index so the join in _flush_output lines up even when rows get skipped
+        self.processed_index.append(idx)
+        self.job_counter+=1
+        if self.scrape_state is not None:
+            self.scrape_state.record(scrape_row.url,
+                getattr(scrape_row, self.freshness_column, None),
+                self._page_hashes.pop(scrape_row.url, None),
+                row_data_list)
+        # a restored row may already be in this run's log (same-day resume)
+        if not (restored and scrape_row.url in self.checkpoint_log.logged_urls):
+            self.checkpoint_log.append(scrape_row.url, row_data_list)
+
+        # deferred analysis still has to fill these rows in, so they stay buffered until the end
+        if len(self.processed_data) >= self.output_buffer_rows and not self._holding_output():
+            self._flush_output()
+
+    def _holding_output(self) -> bool:
+        return bool(self.deferred_analysis and not self.dev_mode)
 
     def _start_browser(self): 
+        '''Return a new browser. Called by the browser pool; override to use a different driver.'''
         headOption = webdriver.FirefoxOptions()
         headOption.add_argument('-headless')
-        self.browser = webdriver.Firefox(options=headOption)
+        return webdriver.Firefox(options=headOption)
 
     def _scrape_url(self, url:str) -> dict[str,str]:
+        if self.fetch_mode == "archive":
+            return self._scrape_url_archive(url)
+        if self.fetch_mode == "http":
+            return self._scrape_url_http(url)
+
         print(f"scraping url: {url}")
-        self.browser.get(url)
-        time.sleep(5)
+        with self.progress.stage("fetch"):
+            self.browser_pool.checkout().get(url)
+            self._wait_for_page()
+        self._archive_page(url)
 
         payload = {}
-        for path_meta in self.xpaths:
-            # print(self.browser.page_source)
-            element = self.browser.find_elements(By.XPATH,path_meta['xpath'])
-            try:
-                payload[path_meta['name']] = path_meta['func'](element)
-            except:
-                print(f"Oops! We couldn't find the following element: {path_meta['name']} for this job description. Don't worry, we'll get the rest.")
-                continue
+        with self.progress.stage("extract"):
+            for path_meta in self.xpaths:
+                # print(self.browser.page_source)
+                element = self.browser.find_elements(By.XPATH,path_meta['xpath'])
+                try:
+                    payload[path_meta['name']] = path_meta['func'](element)
+                except:
+                    print(f"Oops! We couldn't find the following element: {path_meta['name']} for this job description. Don't worry, we'll get the rest.")
+                    continue
+
+        assert 'title' in payload, "Config does not contain a title XPath"
+        assert 'description' in payload, "Config does not contain a description XPath"
+        return payload
+
+    def _wait_for_page(self) -> float:
+        '''Wait until the current page is ready per self.wait_strategy, up to self.wait_timeout seconds.
+        On timeout we carry on and extract whatever is there, same as after the old fixed sleep.
+        Returns (and records) the seconds spent waiting.'''
+        browser = self.browser
+        conditions = {
+            "xpaths":self._page_has_required_xpaths,
+            "ready_state":lambda driver: driver.execute_script("return document.readyState") == "complete",
+            "network_idle":self._page_network_idle(),
+        }
+        assert self.wait_strategy in conditions, f"Wait strategy '{self.wait_strategy}' not available. Options are {list(conditions.keys())}"
+
+        started = time.monotonic()
+        try:
+            WebDriverWait(browser, self.wait_timeout, poll_frequency=0.1).until(conditions[self.wait_strategy])
+        except TimeoutException:
+            self.wait_timeouts += 1
+            print(f"Page wasn't ready after {self.wait_timeout}s ({self.wait_strategy}); extracting what's there.")
+        waited = time.monotonic() - started
+        self.wait_times.append(waited)
+        return waited
+
+    def _required_xpaths(self) -> list[str]:
+        '''XPaths the "xpaths" wait strategy waits on: title and description, plus any entry marked "required": True.
+        Optional ones (e.g. meta) are legitimately missing on some postings, so waiting on them would burn the whole budget.'''
+        if isinstance(self.xpaths, dict):
+            return [self.xpaths[name] for name in ['title', 'description'] if name in self.xpaths]
+        return [path_meta['xpath'] for path_meta in self.xpaths
+            if path_meta.get('required', path_meta['name'] in ['title', 'description'])]
+
+    def _page_has_required_xpaths(self, driver) -> bool:
+        return all(driver.find_elements(By.XPATH, xpath) for xpath in self._required_xpaths())
+
+    def _page_network_idle(self, idle_seconds:float=0.5):
+        '''Condition that holds once the document has loaded and no new resources
+        have been requested for idle_seconds.'''
+        state = {"resources":-1, "since":time.monotonic()}
+
+        def condition(driver):
+            if driver.execute_script("return document.readyState") != "complete":
+                return False
+            resources = driver.execute_script("return performance.getEntriesByType('resource').length")
+            if resources != state["resources"]:
+                state["resources"] = resources
+                state["since"] = time.monotonic()
+                return False
+            return time.monotonic() - state["since"] >= idle_seconds
+        return condition
+
+    def _wait_summary(self) -> str:
+        if not self.wait_times:
+            return "no page waits recorded"
+        waits = sorted(self.wait_times)
+        return (f"{len(waits)} page waits ({self.wait_strategy}, budget {self.wait_timeout}s): "
+            f"avg {sum(waits)/len(waits):.2f}s, median {waits[len(waits)//2]:.2f}s, max {waits[-1]:.2f}s, "
+            f"{self.wait_timeouts} timed out")
+
+    def _scrape_url_http(self, url:str) -> dict[str,str]:
+        '''Same payload as _scrape_url, but from a plain HTTP GET evaluated with lxml.'''
+        print(f"fetching url: {url}")
+        page_source = self._prefetched_pages.pop(url, None)
+        if page_source is None:
+            with self.progress.stage("fetch"):
+                page_source = self.http_fetcher.fetch(url)
+        assert page_source is not None, f"Couldn't fetch {url}"
+        self._archive_page(url, page_source)
+        return self._extract_from_html(page_source)
+
+    def _scrape_url_archive(self, url:str) -> dict[str,str]:
+        '''Same payload as _scrape_url, extracted with lxml from the HTML archived when the url was scraped.'''
+        print(f"replaying url: {url}")
+        page_source = self.replay_archive.get(url)
+        assert page_source is not None, f"{url} isn't in the archive"
+        return self._extract_from_html(page_source)
+
+    def _archive_page(self, url:str, page_source:typing.Union[str,bytes]=None) -> None:
+        '''Store the page's raw HTML (the rendered DOM of the current page by default), if archiving.'''
+        if self.page_archive is None:
+            return
+        if page_source is None:
+            page_source = self.browser.page_source
+        self.page_archive.put(url, page_source)
+
+    def _complete_archive(self) -> None:
+        '''Rows carried forward (--incremental) or restored from a checkpoint weren't fetched this run, so
+        copy their pages in from earlier archives. Rows whose page can't be found anywhere are left out
+        of the archived manifest, so a replay never meets a url it has no page for.'''
+        archived = self.page_archive.urls()
+        missing = [url for url in self.manifest_df['url'] if url not in archived]
+        for path in PageArchive.earlier_archives(self.company_name, self.page_archive.path, directory=os.path.dirname(self.page_archive.path)):
+            if not missing:
+                break
+            if self.page_archive.copy_pages(path, missing):
+                archived = self.page_archive.urls()
+                missing = [url for url in missing if url not in archived]
+        if missing:
+            print(f"{len(missing)} rows have no archived page and are left out of the archive's manifest")
+        self.page_archive.save_manifest(self.manifest_df[self.manifest_df['url'].isin(archived)])
+
+    def _extract_from_html(self, page_source:typing.Union[str,bytes]) -> dict[str,str]:
+        '''Evaluate the configured XPaths against raw page HTML with lxml.
+        Response bytes are parsed as-is, so lxml reads the document's own encoding declaration.
+        Config funcs written for Selenium elements are swapped for their lxml equivalents.'''
+        payload = {}
+        with self.progress.stage("extract"):
+            if isinstance(page_source, str):
+                # lxml rejects str input that carries an <?xml ... encoding=...?> declaration; the text is already decoded
+                tree = html.fromstring(page_source.encode("utf-8"), parser=html.HTMLParser(encoding="utf-8"))
+            else:
+                tree = html.fromstring(page_source)
+            for path_meta in self.xpaths:
+                func = path_meta.get('lxml_func', LXML_EXTRACTORS.get(path_meta['func'], path_meta['func']))
+                try:
+                    payload[path_meta['name']] = func(tree.xpath(path_meta['xpath']))
+                except:
+                    print(f"Oops! We couldn't find the following element: {path_meta['name']} for this job description. Don't worry, we'll get the rest.")
+                    continue
 
         assert 'title' in payload, "Config does not contain a title XPath"
         assert 'description' in payload, "Config does not contain a description XPath"
         return payload
 
-    def _run_base_analysis(self, raw_job:dict):
-        processed_description = preprocess_description_text(raw_job)
-        spelling_mistakes, grammar_mistakes, langtools_detail = get_langtools_feedback(processed_description)
+    def _run_base_analysis(self, raw_job:dict, posting:ParsedPosting=None):
+        posting = posting or ParsedPosting(raw_job)
+        processed_description = posting.text
+        spelling_mistakes, grammar_mistakes, langtools_detail = self._get_langtools_feedback(processed_description)
+        open_ai = self._get_cached_openai_analysis(processed_description, raw_job["description"])
 
-        return {'masculine_count':gender_analysis(raw_job["description"],"masculine"), 
-            'feminine_count':gender_analysis(raw_job["description"],"feminine"), 
+        # one pass over the text (not the raw HTML) scores both genders
+        gender_scan = self.gender_lexicon.scan_tokens(posting.tokens)
+
+        return {'masculine_count':gender_scan["counts"]["masculine"], 
+            'feminine_count':gender_scan["counts"]["feminine"], 
+            'gendered_term_hits':gender_scan["hits"], 
             'grammar_mistakes':grammar_mistakes,
             'spelling_mistakes':spelling_mistakes,
             'langtools_detail':langtools_detail,
-            'bullet_point_count':count_bullets(raw_job['description']),
-            'duplicate_sentences_count':self._count_duplicate_sentences(raw_job["description"]), 
-            'open_ai_base':self._get_openai_analysis(raw_job["description"]), 
-            'open_ai_cx':self._get_openai_analysis(raw_job["description"], mode="cx")}
+            'bullet_point_count':posting.bullet_count,
+            'duplicate_sentences_count':posting.duplicate_sentence_count, 
+            'open_ai_base':open_ai["base"], 
+            'open_ai_cx':open_ai["cx"]}
+
+    def _get_langtools_feedback(self, processed_description:str):
+        '''get_langtools_feedback, answered from the analysis cache when this text has been checked before.'''
+        if self.analysis_cache is None:
+            with self.progress.stage("langtools"):
+                return get_langtools_feedback(processed_description)
+
+        key = self.analysis_cache.make_key(processed_description)
+        cached = self.analysis_cache.get("langtools", key)
+        if cached is not None:
+            return tuple(cached)
+
+        with self.progress.stage("langtools"):
+            feedback = get_langtools_feedback(processed_description)
+        # a None count means the API call failed; don't cache that
+        if feedback[0] is not None:
+            self.analysis_cache.put("langtools", key, list(feedback))
+        return feedback
+
+    def _openai_cache_key(self, processed_description:str) -> str:
+        return self.analysis_cache.make_key(processed_description, self.OPENAI_PROMPTS, self.OPENAI_SYSTEM_MESSAGE, self.OPENAI_MODE_FRAMING, OPENAI_MODEL)
+
+    def _get_cached_openai_analysis(self, processed_description:str, job_description_raw:str) -> dict[str,dict[str,str]]:
+        '''Run the base and cx OpenAI evaluations, answered from the analysis cache when the
+        same text was evaluated with the same prompts and model before.'''
+        cache = self.analysis_cache if not self.dev_mode else None
+        if cache is not None:
+            key = self._openai_cache_key(processed_description)
+            cached = cache.get("openai", key)
+            if cached is not None:
+                return cached
+
+        if self.deferred_analysis and not self.dev_mode:
+            # answered later by the Batch API, see _run_deferred_openai_analysis
+            return {mode:{header:None for header in prompts} for mode, prompts in self.OPENAI_PROMPTS.items()}
+
+        with self.progress.stage("openai"):
+            if self.batch_prompts:
+                open_ai = self._get_openai_batched_analysis(job_description_raw)
+            else:
+                open_ai = self._get_openai_analysis(job_description_raw)
+
+        # only keep complete answers, so a row that hit an API error gets retried next run
+        if cache is not None and all(header in open_ai[mode] for mode, prompts in self.OPENAI_PROMPTS.items() for header in prompts):
+            cache.put("openai", key, open_ai)
+        return open_ai
 
     def _count_duplicate_sentences(self, corpus:str)->int:
-        soup = BeautifulSoup(corpus, "lxml")
-        text = soup.get_text()
-
-        sentences = nltk.sent_tokenize(text)
-        sent_set = set(sentences)
-
-        diff = len(sentences) - len(sent_set)
-        return diff
-
-    def _get_openai_analysis(self, job_description_raw:str, mode:str="base") -> dict[str,str]:
-        prompts_lookup = {
-            "base":{
-                "jd_structure_eval":'PROPRIETARY EVAL QUERY',
-                "salary_compliance":'PROPRIETARY EVAL QUERY', 
-                "jd_text_eval":'PROPRIETARY EVAL QUERY',
-            },
-            "cx":{
-                "cx_eval_1":'PROPRIETARY EVAL QUERY', 
-                "cx_eval_2":"PROPRIETARY EVAL QUERY",
-                "cx_eval_3":'''PROPRIETARY EVAL QUERY''',
-                "cx_eval_4":'''PROPRIETARY EVAL QUERY''',
-                "cx_eval_5":'''PROPRIETARY EVAL QUERY''',
-            }
-        }
-        system_messages = {
-            "base":f'Consider this job description: {job_description_raw}',
-            "cx":f'''You are a job candidate reviewing a job description for an open role. Consider the following job description: {job_description_raw}'''
-        }
-        helpers = {
-            "base":"OpenAI prompts we run for everyone.",
-            "cx":"[C]andidate e[X]perience -- OpenAI prompts geared toward talent attraction."
-            }
-
-        assert mode in list(helpers.keys()), f"Mode '{mode}' not available. Options are {helpers}"
+        return ParsedPosting({"description":corpus}).duplicate_sentence_count
+
+    def _get_openai_analysis(self, job_description_raw:str, headers:list[str]=None) -> dict[str,dict[str,str]]:
+        '''Run the base and cx prompts (or just the given headers) one question per request.
+        All requests share one system message, so the first one is sent alone to warm the
+        provider's prefix cache; the rest follow, prompt_concurrency at a time.'''
+        system_message = self.OPENAI_SYSTEM_MESSAGE.format(job_description=job_description_raw)
+        questions = [(mode, header, self.OPENAI_MODE_FRAMING[mode] + prompt)
+            for mode, prompts in self.OPENAI_PROMPTS.items()
+            for header, prompt in prompts.items()
+            # optionally only run a subset of the prompts (used to backfill a batched request)
+            if headers is None or header in headers]
+
+        responses = {mode:{} for mode in self.OPENAI_PROMPTS}
+        if not questions:
+            return responses
+
+        self._run_eval_prompt(system_message, *questions[0], responses)
+        if self.prompt_concurrency > 1 and len(questions) > 1:
+            with ThreadPoolExecutor(max_workers=self.prompt_concurrency) as pool:
+                list(pool.map(lambda question: self._run_eval_prompt(system_message, *question, responses), questions[1:]))
+        else:
+            for question in questions[1:]:
+                self._run_eval_prompt(system_message, *question, responses)
+        return responses
 
-        responses = {}
+    def _run_eval_prompt(self, system_message:str, mode:str, header:str, user_prompt:str, responses:dict) -> None:
+        try:
+            response, usage = run_prompt(system_message,user_prompt,dev_mode=self.dev_mode)
+            responses[mode][header] = response
+            if not self.dev_mode:
+                log_openai_usage(usage, header, self.company_name, self.dev_mode)
+
+        except openai.APIConnectionError as e:
+            print("The server could not be reached")
+            print(e.__cause__)  # an underlying Exception, likely raised within httpx.
+        except openai.RateLimitError as e:
+            print("OpenAI says we're yapping; we should back off a bit.")
+        except openai.APIStatusError as e:
+            print("Another non-200-range status code was received:")
+            print(e.status_code)
+            print(e.response)
+
+    def _get_openai_batched_analysis(self, job_description_raw:str) -> dict[str,dict[str,str]]:
+        '''Ask every base and cx question in a single request and read the answers
+        back out of a JSON object keyed by column header.
+        Any header the model didn't answer gets re-run through the per-prompt path.'''
+        questions = []
+        for mode, prompts in self.OPENAI_PROMPTS.items():
+            for header, prompt in prompts.items():
+                framing = self.OPENAI_MODE_FRAMING[mode]
+                questions.append(f'"{header}": {framing}{prompt}')
+
+        system_message = self.OPENAI_SYSTEM_MESSAGE.format(job_description=job_description_raw)
+        user_prompt = (
+            "Answer each of the following questions about the job description. "
+            "Respond with a single JSON object. Use the quoted id before each question as the key "
+            "and your answer to that question, as a string, as the value.\n\n"
+            + "\n\n".join(questions)
+        )
 
-        for header,prompt in prompts_lookup[mode].items():
-            try:
-                response, usage = run_prompt(system_messages[mode],prompt,dev_mode=self.dev_mode)
-                responses[header] = response
-                if not self.dev_mode:
-                    log_openai_usage(usage, header, self.company_name, self.dev_mode)
-
-            except openai.APIConnectionError as e:
-                print("The server could not be reached")
-                print(e.__cause__)  # an underlying Exception, likely raised within httpx.
-            except openai.RateLimitError as e:
-                print("OpenAI says we're yapping; we should back off a bit.")
-            except openai.APIStatusError as e:
-                print("Another non-200-range status code was received:")
-                print(e.status_code)
-                print(e.response)
+        answers = {}
+        try:
+            response, usage = run_prompt(system_message, user_prompt, dev_mode=self.dev_mode, json_mode=True)
+            if self.dev_mode:
+                answers = {header:response for prompts in self.OPENAI_PROMPTS.values() for header in prompts}
+            else:
+                log_openai_usage(usage, "batched_eval", self.company_name, self.dev_mode)
+                answers = json.loads(response)
+        except json.JSONDecodeError:
+            print("Batched OpenAI response wasn't valid JSON; falling back to one prompt at a time.")
+        except openai.APIConnectionError as e:
+            print("The server could not be reached")
+            print(e.__cause__)
+        except openai.RateLimitError as e:
+            print("OpenAI says we're yapping; we should back off a bit.")
+        except openai.APIStatusError as e:
+            print("Another non-200-range status code was received:")
+            print(e.status_code)
+            print(e.response)
 
+        responses = {}
+        missing = []
+        for mode, prompts in self.OPENAI_PROMPTS.items():
+            responses[mode] = {header:str(answers[header]) for header in prompts if answers.get(header) is not None}
+            missing.extend(header for header in prompts if header not in responses[mode])
+        if missing:
+            for mode, backfill in self._get_openai_analysis(job_description_raw, headers=missing).items():
+                responses[mode].update(backfill)
         return responses
 
-    def _run_company_analysis(self,payload):
-        ## SHOULD BE OVERLOADED ##
-        # Placeholder here to enable functionality
-        return []
-
-    def _extend_with_company_analysis(self, source_row, working_payload):
-        columns=BASE_HEADERS + [
-        "url_sc", "last_modified"
-        ]
-        payload = working_payload
-        payload.extend(source_row)
-        return self._run_company_analysis(dict(zip(columns,payload)))
+    def _run_deferred_openai_analysis(self) -> None:
+        '''Compile every unanswered base/cx prompt across processed_data into one Batch API job,
+        wait for it, and write the answers back into the rows' OpenAI columns.
+        Resubmitting identical input picks the earlier batch back up instead of paying twice.'''
+        columns = {header:BASE_HEADERS.index(header) for prompts in self.OPENAI_PROMPTS.values() for header in prompts}
+        description_column = BASE_HEADERS.index('job_desc')
+
+        batch_requests = []
+        for position, row in enumerate(self.processed_data):
+            system_message = self.OPENAI_SYSTEM_MESSAGE.format(job_description=row[description_column])
+            for mode, prompts in self.OPENAI_PROMPTS.items():
+                for header, prompt in prompts.items():
+                    if row[columns[header]] is not None:
+                        continue
+                    batch_requests.append({"custom_id":f"{position}|{header}",
+                        "body":{"model":OPENAI_MODEL,
+                            "messages":[ { "role": "system", "content" : system_message },
+                                {"role": "user", "content": self.OPENAI_MODE_FRAMING[mode] + prompt } ]}})
+        if not batch_requests:
+            return
+
+        print(f"| --- Submitting {len(batch_requests)} deferred OpenAI evaluations as a batch --- |")
+        batch_path = f"{self.company_name}_openai_batch_{self.TODAYS_DATE}.jsonl"
+        input_hash = build_batch_file(batch_requests, batch_path)
+        client = get_openai_client()
+        batch_id = submit_batch(client, batch_path, input_hash, state_path=batch_path.replace(".jsonl", "_state.json"))
+        batch = wait_for_batch(client, batch_id, poll_seconds=self.batch_poll_seconds)
+
+        results = read_batch_results(client, batch)
+        for custom_id, completion in results.items():
+            position, header = custom_id.split("|")
+            self.processed_data[int(position)][columns[header]] = completion.choices[0].message.content
+            log_openai_usage(completion.usage, f"batch_{header}", self.company_name, self.dev_mode)
+        print(f"| --- Merged {len(results)}/{len(batch_requests)} batch answers (batch status: {batch.status}) --- |")
+
+        # the incremental state recorded these rows before their answers came back
+        if self.scrape_state is not None:
+            url_column = BASE_HEADERS.index('url')
+            for position in {int(custom_id.split("|")[0]) for custom_id in results}:
+                row = self.processed_data[position]
+                self.scrape_state.update_row(row[url_column], row)
+
+        # complete rows can go into the analysis cache like any other
+        if self.analysis_cache is not None:
+            for row in self.processed_data:
+                if any(row[column] is None for column in columns.values()):
+                    continue
+                processed_description = ParsedPosting({"description":row[description_column]}).text
+                key = self._openai_cache_key(processed_description)
+                self.analysis_cache.put("openai", key,
+                    {mode:{header:row[columns[header]] for header in prompts} for mode, prompts in self.OPENAI_PROMPTS.items()})
+
+    def _run_company_analysis(self, frame:pd.DataFrame) -> pd.DataFrame:
+        '''Company-specific columns, computed over the whole frame at once.
+        frame holds the BASE_HEADERS columns plus the manifest's (suffixed _sc where the names clash).
+        Return a DataFrame on frame's index; by default, one column per configured rule.'''
+        return self.rule_engine.scan_frame(frame)
 
     def _run_company_post_processing(self):
-        print(f"Rows: {len(self.processed_data)} x Columns: {len(self.processed_data[0])}")
-        self.data_payload = pd.DataFrame(
-        self.processed_data,
-        columns = BASE_HEADERS
-        )
+        '''Build data_payload from the buffered rows and add the company columns. Runs once per output chunk.'''
+        # rows checkpointed by older versions carry manifest and company values after the base columns
+        rows = [row[:len(BASE_HEADERS)] for row in self.processed_data]
+        self.data_payload = pd.DataFrame(rows, columns=BASE_HEADERS, index=self.processed_index)
+        frame = self.data_payload.join(self.manifest_df.loc[self.data_payload.index], rsuffix="_sc")
+        self.data_payload = self.data_payload.join(self._run_company_analysis(frame))
+
+    def _flush_output(self) -> None:
+        '''Write the buffered rows: post-process them, join them to their manifest rows and
+        append them to the CSV (and Parquet), then drop them from memory. Rows arrive in
+        manifest order, so the output comes out in order without an end-of-run merge.'''
+        if not self.processed_data and self.rows_written:
+            return
+        self._run_company_post_processing()
+
+        ## Join the rows with the data originally gotten as part of the base URL scrape.
+        chunk = self.manifest_df.loc[self.data_payload.index].merge(self.data_payload,left_index=True,right_index=True, suffixes=(None,"_scraped"))
+        chunk['scrape_date'] = self.TODAYS_DATE
+        chunk = chunk.loc[:,~chunk.columns.str.contains('_sc$|_scraped', regex=True)]
+
+        first_chunk = self._output_columns is None
+        if first_chunk:
+            self._output_columns = list(chunk.columns)
+            if self.parquet_dir is not None:
+                self.parquet_writer = ParquetPartitionWriter(self.run_name, self.TODAYS_DATE, root=self.parquet_dir)
+        chunk = chunk.reindex(columns=self._output_columns)
+        chunk.to_csv(self.output_path, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+        if self.parquet_writer is not None:
+            self.parquet_writer.write(chunk)
+
+        self.rows_written += len(chunk)
+        self.processed_data = []
+        self.processed_index = []
+        self.data_payload = None
 
     def process_jobs(self):
-        print(f"| --- Processing {self.company_name} sitemap --- |")
-        self._process_sitemap()
+        try:
+            self._run_jobs()
+            self.progress.set_phase("finished")
+        except Exception:
+            self.progress.set_phase("failed")
+            raise
+        finally:
+            # never leave browsers running, even when the run fails
+            self.browser_pool.quit_all()
+            if self.parquet_writer is not None:
+                # leave a readable file behind for the rows already written
+                self.parquet_writer.close()
+
+    def _run_jobs(self):
+        self.progress.set_phase("sitemap")
+        if self.replay_archive is not None:
+            self._load_archived_manifest()
+        else:
+            print(f"| --- Processing {self.company_name} sitemap --- |")
+            self._process_sitemap()
+        if self.page_archive is not None:
+            self.page_archive.save_manifest(self.manifest_df)
         print("| --- Processing job descriptions --- |")
+        self.progress.set_phase("scraping", total=self.num_jobs)
         self._process_job_descriptions()
-        print("| --- Running post-processing --- |")
-        self._run_company_post_processing()
-
-        ## Merge any data originally gotten as part of the base URL scrape with the processed row data.
-        self.finalized_dataset = self.manifest_df.merge(self.data_payload,left_index=True,right_index=True, suffixes=(None,"_scraped"))
-
-        self.finalized_dataset['scrape_date'] = self.TODAYS_DATE
-
-        self.finalized_dataset.loc[:,~self.finalized_dataset.columns.str.contains('_sc$|_scraped', regex=True)].to_csv(f"{self.company_name}_merged_table_{self.TODAYS_DATE}.csv",index=False)
-
+        if self.page_archive is not None:
+            self._complete_archive()
+        self.checkpoint_log.close()
+        self.progress.report()
+        if self.deferred_analysis and not self.dev_mode:
+            self.progress.set_phase("deferred_analysis")
+            self._run_deferred_openai_analysis()
+        if self.scrape_state is not None:
+            self.scrape_state.save(keep_urls=self.manifest_df['url'])
+            self.scrape_state.close()
+        print("| --- Writing the remaining rows --- |")
+        self.progress.set_phase("post_processing")
+        self._flush_output()
+        print(f"Rows written: {self.rows_written}")
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+            print(f"Parquet: {self.parquet_writer.path}")
+
+        if not self.dev_mode:
+            print(f"OpenAI usage: {openai_usage_summary()}")
+        if openai_rate_limiter.throttled_seconds:
+            print(f"OpenAI pacing: held requests for {openai_rate_limiter.throttled_seconds:.1f}s to stay under rate limits")
+        if self.analysis_cache is not None:
+            self.analysis_cache.evict()
+            print(f"Analysis cache: {self.analysis_cache.stats()}")
+        if self.http_fetcher is not None:
+            self.http_fetcher.close()
+        elif self.fetch_mode == "browser":
+            print(f"Page readiness: {self._wait_summary()}")
+            print(f"Browsers: {self.browser_pool.stats()}")
+        if self.page_archive is not None:
+            print(f"Page archive: {self.page_archive.path} {self.page_archive.stats()}")
+            self.page_archive.close()
+        if self.replay_archive is not None:
+            self.replay_archive.close()
+
+        print(f"Status: {self.progress.path}")
         print("File saved! You're all done 👍")
-        print(f"Filename: {self.company_name}_merged_table_{self.TODAYS_DATE}.csv")
+        print(f"Filename: {self.output_path}")
 
         if len(self.skipped_urls) > 0:
             skiped_df = pd.DataFrame(self.skipped_urls, columns=['url'])
-            skiped_df.to_csv(f"{self.company_name}_skipped_urls_{self.TODAYS_DATE}.csv",index=False)
+            skiped_df.to_csv(f"{self.run_name}_skipped_urls_{self.TODAYS_DATE}.csv",index=False)
 
             print("⚠️ We skipped some url's ⚠️")
-            print(f"Filename: {self.company_name}_skipped_urls_{self.TODAYS_DATE}.csv")
+            print(f"Filename: {self.run_name}_skipped_urls_{self.TODAYS_DATE}.csv")
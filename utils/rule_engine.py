@@ -0,0 +1,131 @@
+# Standard library imports
+import re
+import warnings
+
+# Third-party imports
+import pandas as pd
+
+# Local application imports
+from utils.parsed_posting import ParsedPosting
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+RULE_KINDS = ["any", "all", "extract"]
+
+# regex metacharacters; a pattern without any of them is a plain phrase
+_REGEX_SPECIAL = set(r".^$*+?{}[]\|()")
+
+class _Check():
+    """One compiled pattern. Plain phrases skip the regex engine and use substring search."""
+    def __init__(self, pattern:str, anchored:bool=False):
+        self.pattern = pattern
+        self.anchored = anchored
+        self.literal = not any(char in _REGEX_SPECIAL for char in pattern)
+        self.regex = re.compile(r"\A(?:" + pattern + ")" if anchored else pattern)
+
+class RuleEngine():
+    """
+    Declarative regex checks for company-specific analysis (see "rules" in scraper_configs.py).
+
+    Each rule names one or more row fields and a list of patterns:
+        - "any":     1 if any pattern is found in any of the fields, else 0
+        - "all":     1 if every pattern is found in one of the fields, else 0
+        - "extract": group 1 of the first match of the (single) pattern, else the rule's default
+    "anchored": True gives re.match semantics (the pattern must match at the start of the field).
+    Fields are row columns, or "posting.<attr>" for a view of the row's ParsedPosting (e.g. "posting.text").
+
+    Every pattern is compiled once, on its own, so patterns keep their own groups and
+    backreferences. Plain phrases are matched with substring search instead of the regex
+    engine. A pattern shared by several rules is only searched once per field.
+    """
+    def __init__(self, rules:list[dict]):
+        self.rules = rules
+        self._checks = {}   # (pattern, anchored) -> _Check, shared between rules
+        self._plan = []     # per rule: (fields, [_Check, ...])
+
+        for rule in rules:
+            assert rule.get("kind", "any") in RULE_KINDS, f"Rule kind '{rule.get('kind')}' not available. Options are {RULE_KINDS}"
+            assert rule.get("kind") != "extract" or len(rule["patterns"]) == 1, f"Extract rule '{rule['name']}' takes exactly one pattern"
+            fields = rule["field"] if isinstance(rule["field"], list) else [rule["field"]]
+            checks = []
+            for pattern in rule["patterns"]:
+                key = (pattern, bool(rule.get("anchored")))
+                if key not in self._checks:
+                    self._checks[key] = _Check(pattern, anchored=key[1])
+                checks.append(self._checks[key])
+            self._plan.append((fields, checks))
+        self._fields = list(dict.fromkeys(field for fields, _ in self._plan for field in fields))
+
+    def scan_frame(self, frame:pd.DataFrame) -> pd.DataFrame:
+        '''Evaluate every rule against every row of a DataFrame, one column per rule on the frame's index.
+        Each pattern runs column-wise over a field (str.contains / str.startswith / str.extract)
+        instead of row by row. Rows only keep the BASE_HEADERS columns, not their ParsedPosting,
+        so "posting.*" fields re-parse job_desc here: once per row per call, whatever the number
+        of posting fields or rules.'''
+        postings = None
+        if any(field.startswith("posting.") for field in self._fields):
+            descriptions = frame['job_desc'] if 'job_desc' in frame else [""]*len(frame)
+            postings = [ParsedPosting({"description":description if isinstance(description, str) else ""}) for description in descriptions]
+        texts = {field:self._text_column(frame, field, postings) for field in self._fields}
+
+        seen = {}   # (check, field) -> bool Series, so shared patterns run once per field
+        def found(check, field):
+            if (check, field) not in seen:
+                seen[(check, field)] = self._found_column(check, texts[field])
+            return seen[(check, field)]
+
+        results = {}
+        for rule, (fields, checks) in zip(self.rules, self._plan):
+            kind = rule.get("kind", "any")
+            if kind == "extract":
+                results[rule["name"]] = self._extract_column(rule, checks[0], [texts[field] for field in fields])
+                continue
+            per_check = []
+            for check in checks:
+                hits = found(check, fields[0])
+                for field in fields[1:]:
+                    hits = hits | found(check, field)
+                per_check.append(hits)
+            combined = per_check[0]
+            for hits in per_check[1:]:
+                combined = combined | hits if kind == "any" else combined & hits
+            results[rule["name"]] = combined.astype(int)
+        return pd.DataFrame(results, index=frame.index, columns=[rule["name"] for rule in self.rules])
+
+    @staticmethod
+    def _text_column(frame:pd.DataFrame, field:str, postings:list) -> pd.Series:
+        '''A field as a Series of strings; missing fields and non-text values read as empty.'''
+        if field.startswith("posting."):
+            attr = field.split(".", 1)[1]
+            column = pd.Series([getattr(posting, attr) for posting in postings], index=frame.index, dtype=object)
+        elif field in frame:
+            column = frame[field].astype(object)
+        else:
+            return pd.Series([""]*len(frame), index=frame.index, dtype=object)
+        return column.where(column.map(lambda value: isinstance(value, str)), "")
+
+    @staticmethod
+    def _found_column(check:_Check, texts:pd.Series) -> pd.Series:
+        if check.literal:
+            return texts.str.startswith(check.pattern) if check.anchored else texts.str.contains(check.pattern, regex=False)
+        # pandas warns about capture groups in contains(); groups are expected in user patterns
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", "This pattern is interpreted as a regular expression", UserWarning)
+            return texts.str.contains(check.regex, regex=True)
+
+    @staticmethod
+    def _extract_column(rule:dict, check:_Check, columns:list[pd.Series]) -> pd.Series:
+        '''The rule's group from the first field (in rule order) that matches, else its default.'''
+        group = rule.get("group", 1)
+        # str.extract only returns capture groups, so the whole match needs one of its own
+        regex = re.compile(f"({check.regex.pattern})") if group == 0 else check.regex
+        values = None
+        for texts in columns:
+            extracted = texts.str.extract(regex, expand=True)
+            value = extracted[group] if isinstance(group, str) else extracted.iloc[:, max(group, 1) - 1]
+            values = value if values is None else values.fillna(value)
+        return values.astype(object).where(values.notna(), rule.get("default", ""))
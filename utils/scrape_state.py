@@ -0,0 +1,137 @@
+# Standard library imports
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+# Local application imports
+from utils.base_utils import json_default
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+def content_hash(raw_job:dict) -> str:
+    '''Hash the scraped page fields we analyze, so we can tell when a posting actually changed.'''
+    encoded = json.dumps([raw_job.get('title'), raw_job.get('description'), raw_job.get('meta')], default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class ScrapeStateStore():
+    """
+    Per-company record of what each URL looked like the last time we processed it:
+        url -> { freshness (sitemap lastmod / API posted date), content_hash, row }
+
+    Incremental runs use it to skip the browser fetch for URLs whose freshness value
+    hasn't moved, and to skip analysis for pages whose content hash hasn't changed.
+    In both cases the prior row is carried forward into this run's output.
+
+    Entries live in {company}_scrape_state.sqlite; only each url's freshness and content hash
+    are held in memory, and rows are read back one at a time when they're carried forward.
+    This run's changes are committed by save(), so a crashed run leaves the previous state intact.
+    Safe to share between worker threads.
+    """
+    def __init__(self, company:str, path:str=None, headers:list[str]=None):
+        self.path = path or f"{company}_scrape_state.sqlite"
+        # rows are positional, so state saved under a different column layout can't be carried forward
+        self.headers = headers
+        self._index = {}    # url -> (freshness, content_hash)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                freshness TEXT,
+                content_hash TEXT,
+                row TEXT NOT NULL
+            )""")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        saved_headers = self._conn.execute("SELECT value FROM meta WHERE key = 'headers'").fetchone()
+        if saved_headers is None:
+            self._import_json(f"{company}_scrape_state.json")
+        elif json.loads(saved_headers[0]) != headers:
+            print(f"Column layout changed since {self.path} was written; starting incremental state fresh.")
+            self._conn.execute("DELETE FROM entries")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('headers', ?)", (json.dumps(headers),))
+        self._conn.commit()
+
+        for url, freshness, page_hash in self._conn.execute("SELECT url, freshness, content_hash FROM entries"):
+            self._index[url] = (freshness, page_hash)
+        print(f"| --- Loaded incremental state for {len(self._index)} urls from {self.path} --- |")
+
+    def _import_json(self, json_path:str) -> None:
+        '''One-off import of the single-file JSON state earlier versions wrote.'''
+        if not os.path.exists(json_path):
+            return
+        with open(json_path, 'r') as f:
+            state = json.load(f)
+        if state.get("headers") != self.headers:
+            print(f"Column layout changed since {json_path} was written; starting incremental state fresh.")
+            return
+        self._conn.executemany("INSERT OR REPLACE INTO entries (url, freshness, content_hash, row) VALUES (?, ?, ?, ?)",
+            ((url, entry.get("freshness"), entry.get("content_hash"), json.dumps(entry["row"], default=json_default))
+                for url, entry in state.get("urls", {}).items()))
+        print(f"Imported incremental state from {json_path}")
+
+    @staticmethod
+    def _normalize(freshness):
+        if freshness is None or freshness != freshness: # NaN
+            return None
+        freshness = str(freshness).strip()
+        return freshness or None
+
+    def _row(self, url:str) -> list:
+        with self._lock:
+            row = self._conn.execute("SELECT row FROM entries WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def unchanged_row(self, url:str, freshness):
+        '''The prior row for this url if its freshness value is known and hasn't changed, else None.'''
+        freshness = self._normalize(freshness)
+        entry = self._index.get(url)
+        if freshness is None or entry is None or entry[0] != freshness:
+            return None
+        return self._row(url)
+
+    def same_content_row(self, url:str, page_hash:str):
+        '''The prior row for this url if the scraped content is identical to last time, else None.'''
+        entry = self._index.get(url)
+        if entry is None or entry[1] != page_hash:
+            return None
+        return self._row(url)
+
+    def content_hash_for(self, url:str):
+        entry = self._index.get(url)
+        return entry[1] if entry else None
+
+    def record(self, url:str, freshness, page_hash:str, row:list) -> None:
+        freshness = self._normalize(freshness)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO entries (url, freshness, content_hash, row) VALUES (?, ?, ?, ?)",
+                (url, freshness, page_hash, json.dumps(row, default=json_default)))
+            self._index[url] = (freshness, page_hash)
+
+    def update_row(self, url:str, row:list) -> None:
+        '''Replace the recorded row for url (e.g. once deferred analysis has filled it in).'''
+        with self._lock:
+            self._conn.execute("UPDATE entries SET row = ? WHERE url = ?", (json.dumps(row, default=json_default), url))
+
+    def save(self, keep_urls=None) -> None:
+        '''Commit this run's entries. If keep_urls is given, urls that dropped off the board are pruned.'''
+        with self._lock:
+            if keep_urls is not None:
+                keep_urls = set(keep_urls)
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (url TEXT PRIMARY KEY)")
+                self._conn.execute("DELETE FROM keep")
+                self._conn.executemany("INSERT OR IGNORE INTO keep (url) VALUES (?)", ((url,) for url in keep_urls))
+                self._conn.execute("DELETE FROM entries WHERE url NOT IN (SELECT url FROM keep)")
+                self._index = {url:entry for url, entry in self._index.items() if url in keep_urls}
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,172 @@
+# Standard library imports
+import gzip
+import io
+import queue
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+# Third-party imports
+import requests
+from requests.adapters import HTTPAdapter
+
+"""
+NOTE: This code has been anonymized for portfolio purposes.
+Actual implementations, patterns, and business logic have been
+modified or redacted to protect client confidentiality.
+"""
+
+GZIP_MAGIC = b"\x1f\x8b"
+# parsed entries a sitemap may have waiting before its reader blocks
+SITEMAP_BUFFER = 1000
+# marks the end of one sitemap's entries
+_DONE = object()
+
+def make_sitemap_session(max_workers:int=8) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def discover_sitemaps(domain:str, session:requests.Session) -> list[str]:
+    '''A sitemap url is used as-is. For a homepage, use the Sitemap: entries in robots.txt,
+    falling back to /sitemap.xml.'''
+    path = urlparse(domain).path
+    if path.endswith(".xml") or path.endswith(".xml.gz"):
+        return [domain]
+
+    root = f"{urlparse(domain).scheme}://{urlparse(domain).netloc}/"
+    try:
+        robots = session.get(urljoin(root, "robots.txt"), timeout=30)
+        robots.raise_for_status()
+        sitemaps = [line.split(":", 1)[1].strip() for line in robots.text.splitlines() if line.lower().startswith("sitemap:")]
+        if sitemaps:
+            return sitemaps
+    except requests.RequestException as e:
+        print(f"Couldn't read robots.txt for {domain}: {e}")
+    return [urljoin(root, "sitemap.xml")]
+
+@contextmanager
+def _open_sitemap(session:requests.Session, url:str):
+    '''Stream a sitemap body, transparently un-gzipping .xml.gz files.
+    (gzip Content-Encoding is already handled by decode_content.)
+    The response is closed on exit, which hands its connection back to the pool.'''
+    response = session.get(url, stream=True, timeout=60)
+    try:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        # otherwise urllib3 closes the body once it's fully read and the buffered reader's next read fails
+        response.raw.auto_close = False
+        stream = io.BufferedReader(response.raw)
+        yield gzip.GzipFile(fileobj=stream) if stream.peek(2)[:2] == GZIP_MAGIC else stream
+    finally:
+        response.close()
+
+def iter_sitemap_entries(stream):
+    '''Yield ("url" | "sitemap", loc, lastmod) from a urlset or sitemapindex without building the whole tree.'''
+    root = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end":
+            continue
+        tag = elem.tag.rsplit("}", 1)[-1]  # namespace-agnostic
+        if tag not in ["url", "sitemap"]:
+            continue
+
+        loc = None
+        lastmod = None
+        for child in elem:
+            child_tag = child.tag.rsplit("}", 1)[-1]
+            if child_tag == "loc" and child.text:
+                loc = child.text.strip()
+            elif child_tag == "lastmod" and child.text:
+                lastmod = child.text.strip()
+        # drop what we've already read so memory stays flat on huge sitemaps
+        root.clear()
+        if loc:
+            yield tag, loc, lastmod
+
+def _scan_sitemap(session:requests.Session, sitemap_url:str, job_regex, transform, out:queue.Queue, stop:threading.Event):
+    '''Read one sitemap file, putting ("url", (url, lastmod)) for each matching page and ("sitemap", loc)
+    for each child sitemap on out as they are parsed, then _DONE. Blocks while out is full,
+    and gives up once stop is set.'''
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        with _open_sitemap(session, sitemap_url) as stream:
+            for tag, loc, lastmod in iter_sitemap_entries(stream):
+                if tag == "sitemap":
+                    item = ("sitemap", loc)
+                else:
+                    if transform is not None:
+                        loc = transform(loc)
+                    if job_regex is not None and not job_regex.search(loc):
+                        continue
+                    item = ("url", (loc, lastmod))
+                if not put(item):
+                    return
+    except (requests.RequestException, ET.ParseError, OSError) as e:
+        print(f"Couldn't read sitemap {sitemap_url}: {e}")
+    finally:
+        put(_DONE)
+
+def iter_sitemap_urls(sitemap_urls:list[str], job_pattern:str=None, session:requests.Session=None, max_workers:int=8, transform=None):
+    """
+    Lazily yield (url, lastmod) for every page in the given sitemaps, following sitemap
+    indexes to any depth. Child sitemaps are fetched up to max_workers at a time and
+    filtered by job_pattern as they're parsed. Urls from the sitemap at the head of the
+    queue are yielded as they're parsed; the others read ahead into bounded buffers
+    (SITEMAP_BUFFER entries each), so memory stays bounded and urls come out in sitemap order.
+    transform, if given, rewrites each url before it is matched.
+    """
+    session = session or make_sitemap_session(max_workers)
+    job_regex = re.compile(job_pattern) if job_pattern else None
+
+    pending = deque(sitemap_urls)
+    seen = set()
+    in_flight = deque()  # (future, entry queue) per sitemap, in submission order
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sitemap") as pool:
+        def submit_pending():
+            while pending and len(in_flight) < max_workers:
+                sitemap_url = pending.popleft()
+                if sitemap_url in seen:
+                    continue
+                seen.add(sitemap_url)
+                out = queue.Queue(maxsize=SITEMAP_BUFFER)
+                in_flight.append((pool.submit(_scan_sitemap, session, sitemap_url, job_regex, transform, out, stop), out))
+
+        try:
+            submit_pending()
+            while in_flight:
+                future, out = in_flight[0]
+                while True:
+                    item = out.get()
+                    if item is _DONE:
+                        break
+                    kind, value = item
+                    if kind == "sitemap":
+                        pending.append(value)
+                        submit_pending()
+                    else:
+                        yield value
+                in_flight.popleft()
+                # surface anything _scan_sitemap didn't handle itself
+                future.result()
+                submit_pending()
+        finally:
+            # lets readers blocked on a full buffer finish if we stop early
+            stop.set()